@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Check that the CLI entry point imports within a time budget.
+
+Runs ``python -X importtime`` in a fresh interpreter for each module, sums the
+cumulative import time of the module itself and fails if it exceeds the budget
+or if a heavy dependency was loaded eagerly.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 100 --modules main services.form_parser
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+# Modules that must only be imported when a browser, model or captcha is needed
+HEAVY_MODULES = ["playwright", "openai", "aiohttp"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def measure_import(module: str) -> dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds per imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+def check_module(module: str, budget_ms: float) -> list[str]:
+    """
+    Measure one module against the budget.
+
+    Args:
+        module: Dotted module name to import
+        budget_ms: Allowed cumulative import time in milliseconds
+
+    Returns:
+        list[str]: Descriptions of the problems found
+    """
+    timings = measure_import(module)
+    elapsed_ms = timings.get(module, 0) / 1000
+    print(f"{module:<30}{elapsed_ms:>10.1f} ms")
+
+    problems = []
+    if elapsed_ms > budget_ms:
+        problems.append(f"import {module} took {elapsed_ms:.1f} ms, budget is {budget_ms:.1f} ms")
+    for heavy in HEAVY_MODULES:
+        if heavy in timings:
+            problems.append(f"import {module} eagerly loads {heavy}")
+    return problems
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Import time budget check")
+    parser.add_argument("--modules", nargs="+", default=["main", "services", "utils", "services.form_parser"],
+                        help="Modules to import")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Allowed cumulative import time per module")
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    problems = []
+    for module in args.modules:
+        problems.extend(check_module(module, args.budget_ms))
+
+    if problems:
+        print("\nImport time check failed:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("\nAll modules import within the budget.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Local stand-in for Lever application pages.
+
+Serves synthetic application forms of configurable size together with fake
+parseResume and location-search endpoints, so extraction and filling can be
+measured without hitting jobs.lever.co.
+"""
+import asyncio
+import html
+import json
+import uuid
+
+from aiohttp import web
+
+COMPANY = "benchmark"
+
+LOCATIONS = [
+    {"name": "New York, NY, United States", "id": "nyc"},
+    {"name": "Newark, NJ, United States", "id": "ewr"},
+    {"name": "San Francisco, CA, United States", "id": "sfo"},
+    {"name": "Austin, TX, United States", "id": "aus"},
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Apply - {company}</title></head>
+<body>
+<div class="content">
+<form id="application-form" action="/{company}/{job_id}/apply" method="POST" enctype="multipart/form-data">
+<div class="section application-form">
+<ul>
+{standard_questions}
+</ul>
+</div>
+<div class="section application-additional">
+<ul>
+{custom_questions}
+</ul>
+</div>
+<button id="btn-submit" type="submit">Submit application</button>
+</form>
+</div>
+<script>
+var searchedLocations = [];
+(function () {{
+    var input = document.querySelector('input.location-input');
+    var container = document.querySelector('.dropdown-container');
+    var results = document.querySelector('.dropdown-results');
+    var loading = document.querySelector('.dropdown-loading-results');
+    var noResults = document.querySelector('.dropdown-no-results');
+    var timer = null;
+
+    input.addEventListener('input', function () {{
+        clearTimeout(timer);
+        container.style.display = 'block';
+        loading.style.display = 'block';
+        noResults.style.display = 'none';
+        results.innerHTML = '';
+        timer = setTimeout(function () {{
+            fetch('/searchLocations?text=' + encodeURIComponent(input.value))
+                .then(function (response) {{ return response.json(); }})
+                .then(function (locations) {{
+                    searchedLocations = locations;
+                    loading.style.display = 'none';
+                    if (!locations.length) {{
+                        noResults.style.display = 'block';
+                        return;
+                    }}
+                    locations.forEach(function (location, index) {{
+                        var option = document.createElement('div');
+                        option.className = 'dropdown-location';
+                        option.id = 'location-' + index;
+                        option.textContent = location.name;
+                        results.appendChild(option);
+                    }});
+                }});
+        }}, 500);
+    }});
+
+    // Answering 'Yes' to the first multiple-choice question reveals a follow-up question
+    var firstChoice = document.querySelector('ul[data-qa="multiple-choice"]');
+    if (firstChoice) {{
+        firstChoice.addEventListener('change', function (event) {{
+            if (event.target.value !== 'Yes' || document.querySelector('.follow-up-question')) {{
+                return;
+            }}
+            var question = document.createElement('li');
+            question.className = 'application-question custom-question follow-up-question';
+            question.innerHTML = {follow_up_question};
+            firstChoice.closest('li').after(question);
+        }});
+    }}
+
+    document.querySelector('input[name="resume"]').addEventListener('change', function (event) {{
+        var data = new FormData();
+        data.append('resume', event.target.files[0]);
+        fetch('/parseResume', {{method: 'POST', body: data}})
+            .then(function (response) {{ return response.json(); }})
+            .then(function (parsed) {{
+                Object.keys(parsed).forEach(function (name) {{
+                    var field = document.querySelector('input[name="' + name + '"]');
+                    if (field && !field.value) {{
+                        field.value = parsed[name];
+                    }}
+                }});
+            }});
+    }});
+}})();
+</script>
+</body>
+</html>
+"""
+
+FOLLOW_UP_NAME = "followUp"
+
+def _label(text: str, required: bool) -> str:
+    required_marker = '<span class="required">&#10033;</span>' if required else ''
+    return f'<div class="application-label">{html.escape(text)}{required_marker}</div>'
+
+def _question(label: str, field_html: str, required: bool = True, extra_class: str = "") -> str:
+    classes = f"application-question {extra_class}".strip()
+    return (
+        f'<li class="{classes}">'
+        f'{_label(label, required)}'
+        f'<div class="application-field">{field_html}</div>'
+        f'</li>'
+    )
+
+def _choices(input_type: str, name: str, values: list[str]) -> str:
+    items = "".join(
+        f'<li><label><input type="{input_type}" name="{html.escape(name)}" value="{html.escape(value)}">'
+        f'<span class="application-answer-alternative">{html.escape(value)}</span></label></li>'
+        for value in values
+    )
+    return f'<ul data-qa="{"multiple-choice" if input_type == "radio" else "checkboxes"}">{items}</ul>'
+
+def standard_questions() -> list[str]:
+    """Return the questions every Lever posting starts with."""
+    location_field = (
+        '<input type="text" name="location" class="location-input" autocomplete="off">'
+        '<input type="hidden" id="selected-location" name="selectedLocation">'
+        '<div class="dropdown-container" style="display: none">'
+        '<div class="dropdown-loading-results" style="display: none">Loading...</div>'
+        '<div class="dropdown-results"></div>'
+        '<div class="dropdown-no-results" style="display: none">No location found</div>'
+        '</div>'
+    )
+    return [
+        _question("Resume/CV", '<input type="file" name="resume">', extra_class="resume"),
+        _question("Full name", '<input type="text" name="name">'),
+        _question("Email", '<input type="email" name="email">'),
+        _question("Phone", '<input type="text" name="phone">'),
+        _question("Current location", location_field),
+        _question("Current company", '<input type="text" name="org">', required=False),
+        _question("LinkedIn URL", '<input type="text" name="urls[LinkedIn]">', required=False),
+    ]
+
+def follow_up_question() -> str:
+    """Return the inner markup of the question revealed by answering 'Yes' to the first multiple-choice question."""
+    return (
+        f'{_label("Please describe your work authorization status.", True)}'
+        f'<div class="application-field"><textarea name="{FOLLOW_UP_NAME}"></textarea></div>'
+    )
+
+def custom_questions(count: int, seed: str = "benchmark") -> list[str]:
+    """
+    Generate custom card questions cycling through every Lever control type.
+
+    Every third question is optional so required-flag detection is exercised.
+
+    Args:
+        count: Number of questions to generate
+        seed: Seed for the deterministic card ids
+
+    Returns:
+        list[str]: The question markup
+    """
+    questions = []
+    for index in range(count):
+        card_id = uuid.uuid5(uuid.NAMESPACE_URL, f"{seed}-{index // 5}")
+        name = f"cards[{card_id}][field{index % 5}]"
+        required = index % 3 != 2
+        kind = index % 5
+
+        if kind == 0:
+            field_html = f'<input type="text" name="{html.escape(name)}">'
+            label = f"What is your preferred name for question {index}?"
+        elif kind == 1:
+            options = "".join(
+                f'<option value="{value}">{value}</option>'
+                for value in ["Less than 1 year", "1-3 years", "3-5 years", "5-10 years", "10+ years"]
+            )
+            field_html = f'<select name="{html.escape(name)}"><option value="">Select...</option>{options}</select>'
+            label = f"How many years of experience do you have with tool {index}?"
+        elif kind == 2:
+            field_html = _choices("radio", name, ["Yes", "No"])
+            label = f"Are you legally authorized to work in region {index}?"
+        elif kind == 3:
+            field_html = _choices("checkbox", name, ["Remote", "Hybrid", "On-site"])
+            label = f"Which work arrangements are acceptable for team {index}?"
+        else:
+            field_html = f'<textarea name="{html.escape(name)}"></textarea>'
+            label = f"Tell us about a project relevant to area {index}."
+
+        questions.append(_question(label, field_html, required=required, extra_class="custom-question"))
+    return questions
+
+def build_application_page(question_count: int, job_id: str = "job") -> str:
+    """
+    Build a synthetic Lever application page.
+
+    Args:
+        question_count: Number of custom card questions
+        job_id: The job id used in the form action
+
+    Returns:
+        str: The page HTML
+    """
+    return PAGE_TEMPLATE.format(
+        company=COMPANY,
+        job_id=job_id,
+        standard_questions="\n".join(standard_questions()),
+        custom_questions="\n".join(custom_questions(question_count, seed=job_id)),
+        follow_up_question=json.dumps(follow_up_question()),
+    )
+
+def application_url(base_url: str, question_count: int) -> str:
+    """Return the stub URL serving a form with the given number of questions."""
+    return f"{base_url}/{COMPANY}/questions-{question_count}/apply"
+
+def create_app(parse_latency: float = 0.2, search_latency: float = 0.2) -> web.Application:
+    """
+    Create the stub application.
+
+    Args:
+        parse_latency: Seconds the fake parseResume endpoint takes to respond
+        search_latency: Seconds the fake location search takes to respond
+
+    Returns:
+        web.Application: The aiohttp application
+    """
+    async def apply_page(request):
+        job_id = request.match_info["job_id"]
+        question_count = int(job_id.rsplit("-", 1)[-1]) if job_id.startswith("questions-") else 10
+        return web.Response(text=build_application_page(question_count, job_id), content_type="text/html")
+
+    async def submit(request):
+        await request.post()
+        raise web.HTTPFound(f"/{request.match_info['company']}/{request.match_info['job_id']}/thanks")
+
+    async def thanks(request):
+        return web.Response(
+            text='<html><body><h3 data-qa="msg-submit-success">Application submitted!</h3></body></html>',
+            content_type="text/html",
+        )
+
+    async def parse_resume(request):
+        await request.read()
+        await asyncio.sleep(parse_latency)
+        return web.json_response({"name": "John Doe", "email": "john.doe@example.com"})
+
+    async def search_locations(request):
+        await asyncio.sleep(search_latency)
+        text = request.query.get("text", "").lower()
+        matches = [location for location in LOCATIONS if text and text.split(",")[0] in location["name"].lower()]
+        return web.Response(text=json.dumps(matches), content_type="application/json")
+
+    app = web.Application(client_max_size=20 * 1024 * 1024)
+    app.router.add_get("/{company}/{job_id}/apply", apply_page)
+    app.router.add_post("/{company}/{job_id}/apply", submit)
+    app.router.add_get("/{company}/{job_id}/thanks", thanks)
+    app.router.add_post("/parseResume", parse_resume)
+    app.router.add_get("/searchLocations", search_locations)
+    return app
+
+async def start_server(host: str = "127.0.0.1", port: int = 8765, **app_options) -> web.AppRunner:
+    """
+    Start the stub server in the running event loop.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        **app_options: Options passed to create_app
+
+    Returns:
+        web.AppRunner: The runner; call its cleanup() to stop the server
+    """
+    runner = web.AppRunner(create_app(**app_options))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,39 @@
+"""
+Mock AI backend with configurable latency for benchmarks.
+"""
+import asyncio
+import json
+
+from services.ai_backends import AIBackend
+from utils.tracing import increment
+
+class MockBackend(AIBackend):
+    """Answers every field the way the prompt's default rules would, after a fixed delay."""
+
+    def __init__(self, latency: float = 1.0):
+        """
+        Args:
+            latency: Seconds each request takes
+        """
+        self.latency = latency
+
+    @staticmethod
+    def answer(schema: dict) -> str:
+        """Return the default answer for a field schema: its first option, or 'Unspecified'."""
+        return (schema.get("enum") or ["Unspecified"])[0]
+
+    async def complete(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Answer from the response schema without calling a model.
+
+        Args:
+            messages: The chat messages (ignored)
+            response_format: The response_format parameter; its schema lists the fields
+
+        Returns:
+            str: A JSON object of field names to answers
+        """
+        await asyncio.sleep(self.latency)
+        increment("llm_requests")
+        properties = response_format.get("json_schema", {}).get("schema", {}).get("properties", {})
+        return json.dumps({name: self.answer(schema) for name, schema in properties.items()})
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of form extraction and filling against the local Lever stub.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 5 25 100 --llm-latency 1.0
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --tolerance 0.25
+    python -m benchmarks.run_benchmarks --replay
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Human-like pauses would dominate the timings, so they are off unless asked for
+os.environ.setdefault("HUMAN_DELAY_SCALE", "0")
+# Keep schema and answer caches from earlier runs out of the measurements
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="lever-bench-"))
+
+from playwright.async_api import async_playwright
+
+from benchmarks.lever_stub import application_url, build_application_page, start_server
+from benchmarks.mock_llm import MockBackend
+from services.ai_backends import ReplayBackend, set_ai_backend
+from services.browser_service import fill_revealed_fields, upload_resume_and_suggest_values
+from services.form_parser import parse_form_fields
+from services.form_service import extract_form_fields, fill_form_fields, watch_form_questions
+from utils.tracing import span, tracer, instrument_page
+
+# Stages reported per form size, in pipeline order
+STAGES = [
+    "navigation",
+    "extract_form_fields",
+    "prepare_values",
+    "suggest_field_values",
+    "resume_parse",
+    "fill_form_fields",
+    "batch_fill_choice_fields",
+    "fill_field",
+    "extract_changed_fields",
+]
+
+def summarize_trace() -> dict:
+    """
+    Sum span durations per stage for the current trace.
+
+    Returns:
+        dict: Stage durations in milliseconds plus call and field counts
+    """
+    summary = {stage: 0.0 for stage in STAGES}
+    fields_filled_individually = 0
+    for record in tracer.spans:
+        if record["name"] in summary and record["duration_ms"] is not None:
+            summary[record["name"]] += record["duration_ms"]
+        if record["name"] == "fill_field":
+            fields_filled_individually += 1
+
+    summary = {stage: round(duration, 1) for stage, duration in summary.items()}
+    summary["playwright_calls"] = tracer.counters.get("playwright_calls", 0)
+    summary["fields_filled_individually"] = fields_filled_individually
+    return summary
+
+async def benchmark_form(browser, base_url: str, question_count: int) -> dict:
+    """
+    Run extraction and filling for one form size.
+
+    Args:
+        browser: The Playwright browser
+        base_url: Base URL of the stub server
+        question_count: Number of custom card questions on the form
+
+    Returns:
+        dict: Stage timings and counts for this form size
+    """
+    tracer.reset()
+    context = await browser.new_context()
+    try:
+        page = instrument_page(await context.new_page())
+        url = application_url(base_url, question_count)
+
+        with span("navigation"):
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector("#application-form")
+
+        required_fields = await extract_form_fields(page)
+
+        # The browser-free parser must agree with the live extraction
+        parsed_fields = parse_form_fields(build_application_page(question_count, url.split("/")[-2]))
+        if parsed_fields != required_fields:
+            raise AssertionError(f"Parser and live extraction disagree for {question_count} questions")
+
+        suggested_values = await upload_resume_and_suggest_values(page, required_fields)
+        remaining_fields = [field for field in required_fields if not field.is_file_input]
+        await watch_form_questions(page)
+        await fill_form_fields(page, remaining_fields, suggested_values)
+        await fill_revealed_fields(page, remaining_fields, suggested_values)
+    finally:
+        await context.close()
+
+    summary = summarize_trace()
+    summary["required_fields"] = len(required_fields)
+    summary["revealed_fields"] = len([field for field in remaining_fields if field not in required_fields])
+    return summary
+
+def print_report(results: dict):
+    """Print stage timings as a table, one column per form size."""
+    sizes = list(results)
+    rows = STAGES + ["playwright_calls", "fields_filled_individually", "required_fields", "revealed_fields"]
+    width = max(len(row) for row in rows) + 2
+
+    print("stage".ljust(width) + "".join(f"{size + ' q':>14}" for size in sizes))
+    for row in rows:
+        suffix = " ms" if row in STAGES else ""
+        print(row.ljust(width) + "".join(f"{str(results[size][row]) + suffix:>14}" for size in sizes))
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Find stages that got slower than the baseline allows.
+
+    Args:
+        results: Current results keyed by form size
+        baseline: Baseline results keyed by form size
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        list[str]: Descriptions of the regressions
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage in STAGES:
+            previous = baseline.get(size, {}).get(stage)
+            if previous and stages[stage] > previous * (1 + tolerance):
+                regressions.append(f"{size} questions / {stage}: {stages[stage]} ms vs {previous} ms baseline")
+    return regressions
+
+async def run(args) -> dict:
+    """Start the stub server and a browser, and benchmark every form size."""
+    runner = await start_server(port=args.port, parse_latency=args.parse_latency, search_latency=args.search_latency)
+    base_url = f"http://127.0.0.1:{args.port}"
+    # Replayed answers come from recordings made with AI_BACKEND_MODE=record
+    set_ai_backend(ReplayBackend() if args.replay else MockBackend(latency=args.llm_latency))
+
+    results = {}
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                for size in args.sizes:
+                    results[str(size)] = await benchmark_form(browser, base_url, size)
+            finally:
+                await browser.close()
+    finally:
+        await runner.cleanup()
+    return results
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Offline form extraction and fill benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 25, 100], help="Custom question counts to benchmark")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Mock LLM latency in seconds")
+    parser.add_argument("--replay", action="store_true", help="Serve recorded model answers instead of the mock LLM")
+    parser.add_argument("--parse-latency", type=float, default=0.2, help="Fake parseResume latency in seconds")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Fake location search latency in seconds")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local Lever stub")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown against the baseline")
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
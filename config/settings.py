@@ -24,14 +24,84 @@ PROXIES = [
 # Browser and navigation settings
 TIMEOUT = int(os.getenv("TIMEOUT", 120000))  # Default: 2 minutes
 HEADLESS = os.getenv("HEADLESS", "False").lower() == "true"
+# Browser contexts served by one Chromium process before it is relaunched
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", 10))
+
+# Resource blocking; only matching requests reach Python, everything else loads untouched
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "True").lower() == "true"
+# Third-party hosts aborted together with their subdomains
+BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "segment.com",
+    "segment.io",
+    "hotjar.com",
+    "fullstory.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "facebook.net",
+    "licdn.com",
+    "ads-twitter.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+]
+# Static asset extensions aborted on every host except hCaptcha
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "wav", "ogg",
+]
+# Extra Playwright URL globs to abort, comma-separated (e.g. "**/widgets/**")
+BLOCKED_URL_GLOBS = [glob for glob in os.getenv("BLOCKED_URL_GLOBS", "").split(",") if glob]
+
+# Multiplier for human-like delays between actions and keystrokes (0 disables them)
+HUMAN_DELAY_SCALE = float(os.getenv("HUMAN_DELAY_SCALE", 1.0))
+
+# Upper bounds for event-driven waits, in milliseconds
+LOCATION_RESULTS_TIMEOUT = int(os.getenv("LOCATION_RESULTS_TIMEOUT", 10000))
+SUBMIT_RESPONSE_TIMEOUT = int(os.getenv("SUBMIT_RESPONSE_TIMEOUT", 30000))
+SUBMIT_CONFIRMATION_TIMEOUT = int(os.getenv("SUBMIT_CONFIRMATION_TIMEOUT", 15000))
+
+# How many times rejected fields are re-filled and the application resubmitted
+SUBMIT_MAX_REFILLS = int(os.getenv("SUBMIT_MAX_REFILLS", 1))
+
+# How many rounds of questions revealed by earlier answers are extracted and filled
+REVEALED_QUESTION_ROUNDS = int(os.getenv("REVEALED_QUESTION_ROUNDS", 3))
 
 # Job application settings
 RESUME_PATH = "resume/resume.pdf"
 USER_METADATA_PATH = "user_metadata/user_metadata.txt"
 
+# Cache settings
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+FORM_SCHEMA_CACHE_DIR = os.path.join(CACHE_DIR, "form_schemas")
+ANSWER_CACHE_PATH = os.path.join(CACHE_DIR, "answers.sqlite3")
+LOCATION_CACHE_PATH = os.path.join(CACHE_DIR, "locations.json")
+
+# Fill select, radio and checkbox fields in a single in-page call
+BATCH_FILL_CHOICES = os.getenv("BATCH_FILL_CHOICES", "True").lower() == "true"
+
+# Run traces with per-stage timings
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+
+# Logging; the log file is rotated by size
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 5 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 3))
+# Write prompts and raw model responses to logs/payloads.log (off by default)
+LOG_PAYLOADS = os.getenv("LOG_PAYLOADS", "False").lower() == "true"
+
 # Form selectors
 APPLICATION_FORM_SELECTOR = "#application-form"
 SUBMIT_BUTTON_SELECTOR = "#btn-submit"
+SUBMIT_CONFIRMATION_SELECTOR = '[data-qa="msg-submit-success"], .application-confirmation'
+SUBMIT_ERROR_SELECTOR = '.application-error, .error-message'
 
 # Captcha related settings
 HCAPTCHA_SELECTORS = [
@@ -41,4 +111,15 @@ HCAPTCHA_SELECTORS = [
 ]
 
 # OpenAI settings
-OPENAI_MODEL = "gpt-4-turbo"
\ No newline at end of file
+# Structured outputs (json_schema response format) need gpt-4o-2024-08-06 or newer
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+OPENAI_STRUCTURED_OUTPUTS = os.getenv("OPENAI_STRUCTURED_OUTPUTS", "True").lower() == "true"
+OPENAI_REASK_ATTEMPTS = int(os.getenv("OPENAI_REASK_ATTEMPTS", 1))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 60))  # Seconds per attempt
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+OPENAI_RETRY_BACKOFF = float(os.getenv("OPENAI_RETRY_BACKOFF", 1.0))  # Seconds, doubled after each retry
+
+# AI backend: "live" calls OpenAI, "record" also saves prompts and responses,
+# "replay" serves saved responses without calling the model
+AI_BACKEND_MODE = os.getenv("AI_BACKEND_MODE", "live")
+AI_RECORDINGS_DIR = os.getenv("AI_RECORDINGS_DIR", "recordings")
\ No newline at end of file
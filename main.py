@@ -2,17 +2,15 @@
 """
 Main entry point for the job application bot.
 """
-import asyncio
 import logging
 import argparse
+import json
 import re
 import sys
-from utils.logging_utils import setup_logging
-from services.browser_service import browse_with_proxy
-from config.settings import PROXIES
+from dataclasses import asdict
 
-# Setup logging
-setup_logging()
+# Browser, OpenAI and captcha modules are imported where they are used, so
+# --help, --validate-only and --parse-form start without loading them
 logger = logging.getLogger(__name__)
 
 def validate_lever_url(url):
@@ -41,38 +39,100 @@ def validate_lever_url(url):
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Lever Job Application Bot')
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         '--url', 
         type=validate_lever_url,
-        required=True,
         help='Target Lever job application URL (https://jobs.lever.co/company/job-id/apply)'
     )
-    return parser.parse_args()
+    target.add_argument(
+        '--parse-form',
+        metavar='FILE',
+        help='Print the required fields of a saved application page as JSON and exit'
+    )
+    parser.add_argument(
+        '--validate-only',
+        action='store_true',
+        help='Validate the URL and exit without opening a browser'
+    )
+    args = parser.parse_args()
+    if args.validate_only and not args.url:
+        parser.error('--validate-only requires --url')
+    return args
 
-async def main():
-    """Main function to run the job application bot."""
-    # Parse arguments
-    args = parse_arguments()
-    target_url = args.url
+def print_form_fields(path):
+    """
+    Print the required fields of a saved application page as JSON.
+    
+    Args:
+        path: Path to the saved HTML file
+    """
+    from services.form_parser import load_form_fields
+
+    fields = load_form_fields(path)
+    print(json.dumps([asdict(field) for field in fields], indent=2, ensure_ascii=False))
+
+async def apply(target_url):
+    """
+    Run the job application bot, trying each proxy in turn.
     
+    Args:
+        target_url: The Lever job application URL
+    """
+    from config.settings import PROXIES
+    from services.browser_manager import BrowserManager
+    from services.browser_service import browse_with_proxy
+    from utils.tracing import write_trace
+
     logger.info(f"Starting job application process for URL: {target_url}")
     
-    is_success = False
-    for proxy in PROXIES:
-        try:
-            logger.info(f"Attempting with proxy: {proxy['server']}")
-            await browse_with_proxy(proxy, target_url)
-            is_success = True
-            break 
-        except Exception as e:
-            logger.warning(f"Failed with proxy {proxy['server']}: {str(e)}")
-            logger.warning("Trying next proxy...")
-            continue
+    outcome = None
+    try:
+        # One Chromium process serves every attempt; each gets a fresh context
+        async with BrowserManager() as browser_manager:
+            for proxy in PROXIES:
+                try:
+                    logger.info(f"Attempting with proxy: {proxy['server']}")
+                    outcome = await browse_with_proxy(proxy, target_url, browser_manager)
+                    # The form was submitted, so another proxy would risk a duplicate application
+                    break 
+                except Exception as e:
+                    logger.warning(f"Failed with proxy {proxy['server']}: {str(e)}")
+                    logger.warning("Trying next proxy...")
+                    continue
+    finally:
+        write_trace()
     
-    if is_success:
+    if outcome is None:
+        logger.error("All proxies have been tried without success.")
+    elif outcome.is_success:
         logger.info("Successfully completed the job application process.")
+    elif outcome.has_validation_errors:
+        logger.error(f"Application was rejected, invalid fields: {outcome.error_fields} ({outcome.message})")
     else:
-        logger.error("All proxies have been tried without success.")
+        logger.error("Application was submitted but no confirmation was found; check the posting manually.")
+    return outcome is not None and outcome.is_success
+
+def main():
+    """Main function to run the job application bot."""
+    # Parse arguments
+    args = parse_arguments()
+
+    if args.parse_form:
+        print_form_fields(args.parse_form)
+        return
+    if args.validate_only:
+        print(f"Valid Lever job application URL: {args.url}")
+        return
+
+    import asyncio
+    from utils.logging_utils import setup_logging
+
+    # Setup logging
+    setup_logging()
+
+    if not asyncio.run(apply(args.url)):
+        sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,3 +1,5 @@
-from models.form_models import Option, FormField
+from models.form_models import (
+    Option, FormField, SubmissionOutcome, SCHEMA_VERSION, serialize_fields, deserialize_fields
+)
 
-__all__ = ['Option', 'FormField']
\ No newline at end of file
+__all__ = ['Option', 'FormField', 'SubmissionOutcome', 'SCHEMA_VERSION', 'serialize_fields', 'deserialize_fields']
\ No newline at end of file
@@ -4,11 +4,23 @@ Data models for form elements and their properties.
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+# Bump whenever the serialized layout of Option/FormField changes
+SCHEMA_VERSION = 1
+
 @dataclass
 class Option:
     """Represents a selectable option in a form field."""
     option_label: str
     option_value: str
+    
+    def to_compact(self) -> list:
+        """Serialize the option as a compact [label, value] pair."""
+        return [self.option_label, self.option_value]
+    
+    @classmethod
+    def from_compact(cls, data: list) -> "Option":
+        """Build an option from its compact [label, value] pair."""
+        return cls(data[0], data[1])
 
 @dataclass
 class FormField:
@@ -40,4 +52,68 @@ class FormField:
     
     def get_first_option_value(self) -> Optional[str]:
         """Get the first option value if options exist."""
-        return self.options[0].option_value if self.options else None
\ No newline at end of file
+        return self.options[0].option_value if self.options else None
+    
+    def to_compact(self) -> list:
+        """Serialize the field as a compact [label, type, name, options] list."""
+        return [self.label, self.input_type, self.input_name, [option.to_compact() for option in self.options]]
+    
+    @classmethod
+    def from_compact(cls, data: list) -> "FormField":
+        """Build a field from its compact [label, type, name, options] list."""
+        label, input_type, input_name, options = data
+        return cls(label, input_type, input_name, [Option.from_compact(option) for option in options])
+
+@dataclass
+class SubmissionOutcome:
+    """Represents the result of submitting an application."""
+    SUCCESS = 'success'
+    VALIDATION_ERROR = 'validation_error'
+    UNKNOWN = 'unknown'
+    
+    status: str
+    error_fields: List[str] = field(default_factory=list)
+    message: str = ''
+    
+    @property
+    def is_success(self) -> bool:
+        """Check if the application was submitted successfully."""
+        return self.status == self.SUCCESS
+    
+    @property
+    def has_validation_errors(self) -> bool:
+        """Check if Lever rejected the submission because of invalid fields."""
+        return self.status == self.VALIDATION_ERROR
+
+def serialize_fields(fields: List[FormField]) -> dict:
+    """
+    Serialize form fields into a compact, versioned payload.
+    
+    Args:
+        fields: List of form fields to serialize
+        
+    Returns:
+        dict: Payload with the schema version and the compact fields
+    """
+    return {"v": SCHEMA_VERSION, "fields": [form_field.to_compact() for form_field in fields]}
+
+def deserialize_fields(payload: dict) -> List[FormField]:
+    """
+    Load form fields from a payload produced by serialize_fields.
+    
+    Args:
+        payload: The serialized payload
+        
+    Returns:
+        List[FormField]: The deserialized form fields
+        
+    Raises:
+        ValueError: If the payload version does not match SCHEMA_VERSION or it is malformed
+    """
+    version = payload.get("v")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported form schema version: {version} (expected {SCHEMA_VERSION})")
+    try:
+        return [FormField.from_compact(data) for data in payload["fields"]]
+    except (KeyError, TypeError, ValueError, IndexError) as e:
+        raise ValueError(f"Malformed form schema payload: {e}") from e
@@ -1,15 +1,24 @@
-from services.browser_service import browse_with_proxy
-from services.form_service import extract_form_fields, fill_form_fields, submit_application
-from services.captcha_service import detect_and_solve_captcha, solve_hcaptcha
-from services.ai_service import suggest_field_values, mock_suggest_field_values
+"""
+Services package; submodules are imported on first attribute access so that
+importing one service does not load Playwright, OpenAI and aiohttp.
+"""
+import importlib
 
-__all__ = [
-    'browse_with_proxy',
-    'extract_form_fields',
-    'fill_form_fields',
-    'submit_application',
-    'detect_and_solve_captcha',
-    'solve_hcaptcha',
-    'suggest_field_values',
-    'mock_suggest_field_values'
-]
\ No newline at end of file
+_EXPORTS = {
+    'browse_with_proxy': 'services.browser_service',
+    'extract_form_fields': 'services.form_service',
+    'fill_form_fields': 'services.form_service',
+    'submit_application': 'services.form_service',
+    'detect_and_solve_captcha': 'services.captcha_service',
+    'solve_hcaptcha': 'services.captcha_service',
+    'suggest_field_values': 'services.ai_service',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
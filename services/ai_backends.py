@@ -0,0 +1,361 @@
+"""
+Pluggable backends that turn chat messages into completions.
+
+The live backend calls OpenAI; the record backend additionally saves each
+prompt and response keyed by a prompt hash, and the replay backend serves
+saved responses back without calling the model.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+from config.settings import (
+    OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TIMEOUT, OPENAI_MAX_RETRIES, OPENAI_RETRY_BACKOFF,
+    OPENAI_STRUCTURED_OUTPUTS, AI_BACKEND_MODE, AI_RECORDINGS_DIR
+)
+from utils.tracing import increment, record_token_usage
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger(__name__)
+
+def retryable_errors() -> tuple:
+    """Return the errors worth retrying; anything else (bad request, auth) fails immediately."""
+    import openai
+
+    return (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        asyncio.TimeoutError,
+    )
+
+class ReplayMissError(LookupError):
+    """Raised when the replay backend has no recording for a prompt."""
+
+class JsonObjectAccumulator:
+    """
+    Collects streamed completion text and detects when the top-level JSON
+    object is complete, so parsing does not wait for trailing fences or prose.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.start = None
+        self.end = None
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    @property
+    def is_complete(self) -> bool:
+        """Check if a complete top-level JSON object has been received."""
+        return self.end is not None
+
+    @property
+    def text(self) -> str:
+        """Return the JSON object if complete, otherwise everything received so far."""
+        if self.is_complete:
+            return self.buffer[self.start:self.end]
+        return self.buffer
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add a chunk of streamed text.
+        
+        Args:
+            chunk: The next piece of the completion
+            
+        Returns:
+            bool: True once the top-level JSON object is complete
+        """
+        offset = len(self.buffer)
+        self.buffer += chunk
+        if self.is_complete:
+            return True
+
+        for index, char in enumerate(chunk, start=offset):
+            if self.start is None:
+                if char == "{":
+                    self.start = index
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = index + 1
+                    return True
+        return False
+
+class AIBackend(ABC):
+    """Interface for turning chat messages into a completion."""
+
+    @abstractmethod
+    async def complete(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Return the completion text for the given messages.
+
+        Args:
+            messages: The chat messages to send
+            response_format: The response_format parameter for the completion
+
+        Returns:
+            str: The completion text
+        """
+
+    async def close(self):
+        """Release any resources held by the backend."""
+
+class LiveBackend(AIBackend):
+    """Streams completions from OpenAI with timeouts and bounded retries."""
+
+    def __init__(self, api_key: Optional[str] = OPENAI_API_KEY, model: str = OPENAI_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self.client: Optional["openai.AsyncOpenAI"] = None
+        self.usage_readers: set[asyncio.Task] = set()
+
+    async def complete(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Run a streamed completion with a timeout and bounded retries with exponential backoff.
+
+        Cancelling the calling task cancels the in-flight request.
+
+        Args:
+            messages: The chat messages to send
+            response_format: The response_format parameter for the completion
+
+        Returns:
+            str: The completion text
+
+        Raises:
+            Exception: The last error once all retries are exhausted
+        """
+        if self.client is None:
+            # Imported on first use so replay runs never load the SDK
+            import openai
+
+            # Retries are handled here so backoff stays visible in the logs
+            self.client = openai.AsyncOpenAI(api_key=self.api_key, timeout=OPENAI_TIMEOUT, max_retries=0)
+
+        for attempt in range(OPENAI_MAX_RETRIES + 1):
+            try:
+                return await asyncio.wait_for(self._stream_completion(messages, response_format), timeout=OPENAI_TIMEOUT)
+            except retryable_errors() as e:
+                if attempt == OPENAI_MAX_RETRIES:
+                    logger.error(f"OpenAI request failed after {attempt + 1} attempts: {str(e) or type(e).__name__}")
+                    raise
+                delay = OPENAI_RETRY_BACKOFF * (2 ** attempt)
+                logger.warning(f"OpenAI request failed ({str(e) or type(e).__name__}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+
+    async def _stream_completion(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Stream a completion and return as soon as the JSON answer is complete.
+
+        With structured outputs only the usage chunk follows the object, so the
+        rest of the stream is read in the background; otherwise it is closed.
+
+        Args:
+            messages: The chat messages to send
+            response_format: The response_format parameter for the completion
+
+        Returns:
+            str: The JSON object, or the full completion text if no object was found
+        """
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format=response_format,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        increment("llm_requests")
+        accumulator = JsonObjectAccumulator()
+        chunks = stream.__aiter__()
+        try:
+            async for chunk in chunks:
+                # Usage arrives in a final chunk without choices
+                if chunk.usage:
+                    record_token_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta and accumulator.feed(delta):
+                    break
+        except BaseException:
+            await stream.close()
+            raise
+
+        if accumulator.is_complete and OPENAI_STRUCTURED_OUTPUTS:
+            reader = asyncio.create_task(self._read_usage(stream, chunks))
+            self.usage_readers.add(reader)
+            reader.add_done_callback(self.usage_readers.discard)
+        else:
+            await stream.close()
+        return accumulator.text
+
+    @staticmethod
+    async def _read_usage(stream, chunks):
+        """Record the usage chunk at the end of a stream, then close it."""
+        try:
+            async for chunk in chunks:
+                if chunk.usage:
+                    record_token_usage(chunk.usage)
+        except Exception as e:
+            logger.debug(f"Could not read token usage from the stream: {str(e) or type(e).__name__}")
+        finally:
+            await stream.close()
+
+    async def close(self):
+        """Close the OpenAI client; a new one is created on the next request."""
+        if self.usage_readers:
+            await asyncio.gather(*self.usage_readers, return_exceptions=True)
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+class RecordingStore:
+    """Prompt/response recordings on disk, one JSON file per prompt hash."""
+
+    def __init__(self, directory: str = AI_RECORDINGS_DIR, model: str = OPENAI_MODEL):
+        self.directory = directory
+        self.model = model
+
+    def key(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Hash everything that determines the completion.
+
+        Args:
+            messages: The chat messages
+            response_format: The response_format parameter
+
+        Returns:
+            str: Hex digest identifying the prompt
+        """
+        payload = json.dumps(
+            {"model": self.model, "messages": messages, "response_format": response_format},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, messages: list[dict], response_format: dict) -> Optional[str]:
+        """Return the recorded response for a prompt, or None if there is none."""
+        try:
+            with open(self._path(self.key(messages, response_format)), "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+
+    def save(self, messages: list[dict], response_format: dict, response: str):
+        """Record the response for a prompt."""
+        key = self.key(messages, response_format)
+        os.makedirs(self.directory, exist_ok=True)
+        recording = {
+            "key": key,
+            "model": self.model,
+            "messages": messages,
+            "response_format": response_format,
+            "response": response,
+        }
+        with open(self._path(key), "w", encoding="utf-8") as f:
+            json.dump(recording, f, indent=2, ensure_ascii=False)
+
+class RecordingBackend(AIBackend):
+    """Passes requests to another backend and records every prompt and response."""
+
+    def __init__(self, inner: AIBackend, store: Optional[RecordingStore] = None):
+        self.inner = inner
+        self.store = store or RecordingStore()
+
+    async def complete(self, messages: list[dict], response_format: dict) -> str:
+        response = await self.inner.complete(messages, response_format)
+        self.store.save(messages, response_format, response)
+        return response
+
+    async def close(self):
+        await self.inner.close()
+
+class ReplayBackend(AIBackend):
+    """Serves recorded responses without calling the model."""
+
+    def __init__(self, store: Optional[RecordingStore] = None):
+        self.store = store or RecordingStore()
+
+    async def complete(self, messages: list[dict], response_format: dict) -> str:
+        """
+        Return the recorded response for the prompt.
+
+        Raises:
+            ReplayMissError: If the prompt was never recorded
+        """
+        response = self.store.load(messages, response_format)
+        if response is None:
+            raise ReplayMissError(
+                f"No recording for prompt {self.store.key(messages, response_format)} in {self.store.directory}"
+            )
+        increment("llm_replays")
+        return response
+
+BACKEND_MODES = ("live", "record", "replay")
+
+_backend_override: Optional[AIBackend] = None
+
+def create_ai_backend(mode: str = AI_BACKEND_MODE) -> AIBackend:
+    """
+    Create the backend for a mode.
+
+    Args:
+        mode: One of 'live', 'record' or 'replay'
+
+    Returns:
+        AIBackend: The backend
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode == "live":
+        return LiveBackend()
+    elif mode == "record":
+        return RecordingBackend(LiveBackend())
+    elif mode == "replay":
+        return ReplayBackend()
+    raise ValueError(f"Unknown AI backend mode: {mode} (expected one of {', '.join(BACKEND_MODES)})")
+
+def set_ai_backend(backend: Optional[AIBackend]):
+    """
+    Use the given backend for all requests, e.g. a mock in benchmarks.
+
+    Args:
+        backend: The backend to use, or None to go back to AI_BACKEND_MODE
+    """
+    global _backend_override
+    _backend_override = backend
+
+def get_ai_backend() -> AIBackend:
+    """Return the backend set with set_ai_backend, or a new one for AI_BACKEND_MODE."""
+    if _backend_override is not None:
+        return _backend_override
+    return create_ai_backend()
@@ -4,120 +4,364 @@ AI services for generating form field values.
 import logging
 import json
 import os
-import openai
-from typing import Dict, List
+from typing import Optional
 
-from config.settings import OPENAI_API_KEY, USER_METADATA_PATH
+from config.settings import OPENAI_STRUCTURED_OUTPUTS, OPENAI_REASK_ATTEMPTS, USER_METADATA_PATH
 from models.form_models import FormField
+from services.ai_backends import AIBackend, get_ai_backend
+from services.answer_cache import AnswerCache, hash_metadata
+from services.option_matcher import OptionIndex, build_option_indexes
+from utils.logging_utils import get_payload_logger
+from utils.tracing import span
 
 logger = logging.getLogger(__name__)
+payload_logger = get_payload_logger()
 
-def mock_suggest_field_values(required_fields: List[FormField]) -> Dict[str, str]:
+def parse_json_response(content: str) -> dict:
     """
-    Mock function to simulate suggest_field_values for testing purposes.
+    Parse the model's JSON answer, tolerating surrounding code fences.
+    
+    Args:
+        content: The completion text
+        
+    Returns:
+        dict: The parsed values, or an empty dict if the text is not valid JSON
+    """
+    try:
+        return json.loads(content.strip().strip("```json").strip("```"))
+    except json.JSONDecodeError as e:
+        print(f"⚠️ JSON Decode Error: {e}")
+        return {}
+
+@span("suggest_field_values")
+async def suggest_field_values(
+    required_fields: list[FormField], option_indexes: Optional[dict[str, OptionIndex]] = None
+) -> dict:
+    """
+    Suggest values for the given fields from the answer cache and the model.
     
     Args:
         required_fields: List of form fields to suggest values for
+        option_indexes: Indexes from build_option_indexes to reuse, built from required_fields if omitted
         
     Returns:
-        Dict[str, str]: Dictionary of field names to suggested values
+        dict: Dictionary of field names to suggested values
     """
-    logger.info("Using mock values for form fields")
+    if option_indexes is None:
+        option_indexes = build_option_indexes(required_fields)
+
+    logging.info("Generating prompt to suggest field values...")
+    user_metadata = load_user_metadata()
+    if user_metadata is None:
+        return {}
+
+    # Reuse answers to recurring questions and only ask the model about the rest
+    with AnswerCache(hash_metadata(user_metadata)) as answer_cache:
+        cached_values = answer_cache.lookup(required_fields)
+        missing_fields = [field for field in required_fields if field.input_name not in cached_values]
+        if not missing_fields:
+            logger.info("All field values served from the answer cache")
+            return cached_values
+
+        suggested_values, invalid_fields = await _request_field_values(user_metadata, missing_fields, option_indexes)
+        answer_cache.store(missing_fields, suggested_values)
+
+    # Fallbacks are not cached so a later run can still get a real answer
+    return {**cached_values, **suggested_values, **fallback_field_values(invalid_fields)}
+
+@span("reask_rejected_values")
+async def reask_rejected_values(
+    rejected_fields: list[FormField],
+    previous_values: dict,
+    message: str = "",
+    option_indexes: Optional[dict[str, OptionIndex]] = None,
+) -> dict:
+    """
+    Ask the model for new values for fields the application form rejected.
     
-    mock_values = {
-        "opportunityLocationId": "5ea282ab-de75-4861-bd77-8a303a3ec812",
-        "resume": "resume.pdf",
-        "name": "John Doe",
-        "email": "john.doe@example.com",
-        "phone": "5173014578",
-        "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field0]": "Unspecified",
-        "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field1]": "New York",
-        "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field2]": "NY",
-        "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field3]": "10013",
-        "cards[1bcdc31d-7a20-4dca-ac48-d0f0e3ce518b][field0]": "Yes",
-        "cards[c6532970-bc1e-40b5-8d79-af03eaa8e7c7][field0]": "No",
-        "cards[899b8aae-97a5-4a12-a40a-55f894160cb9][field0]": "Yes",
-        "cards[899b8aae-97a5-4a12-a40a-55f894160cb9][field1]": "Yes",
-        "cards[899b8aae-97a5-4a12-a40a-55f894160cb9][field2]": "Yes",
-        "cards[899b8aae-97a5-4a12-a40a-55f894160cb9][field3]": "Yes",
-        "cards[7fc211fe-7cee-42db-9263-c17a9ccff9f3][field0]": "Yes",
-        "cards[7fc211fe-7cee-42db-9263-c17a9ccff9f3][field1]": "No",
-        "cards[7fc211fe-7cee-42db-9263-c17a9ccff9f3][field2]": "No",
-        "cards[7fc211fe-7cee-42db-9263-c17a9ccff9f3][field3]": "No",
-        "cards[7fc211fe-7cee-42db-9263-c17a9ccff9f3][field4]": "No"
-    }
+    The rejected answers and the form's error message are included in a re-ask
+    prompt, and the rejected answers are dropped from the answer cache.
+    
+    Args:
+        rejected_fields: List of form fields the form rejected
+        previous_values: Dictionary of field names to the values that were submitted
+        message: The error message shown by the form
+        option_indexes: Indexes from build_option_indexes to reuse, built from rejected_fields if omitted
+        
+    Returns:
+        dict: Dictionary of field names to new values for the fields the model answered
+    """
+    if option_indexes is None:
+        option_indexes = build_option_indexes(rejected_fields)
 
-    return mock_values
+    user_metadata = load_user_metadata()
+    if user_metadata is None:
+        return {}
 
-def suggest_field_values(required_fields: list[FormField]) -> dict:
-    api_key = OPENAI_API_KEY
-    logging.info("Generating prompt to suggest field values...")
+    with AnswerCache(hash_metadata(user_metadata)) as answer_cache:
+        answer_cache.forget(rejected_fields)
+        new_values, _ = await _request_field_values(
+            user_metadata, rejected_fields, option_indexes, previous_values=previous_values, rejection_message=message
+        )
+        answer_cache.store(rejected_fields, new_values)
+    return new_values
+
+def load_user_metadata() -> Optional[str]:
+    """Read the user metadata file, or return None if it is missing."""
     try:
         with open(USER_METADATA_PATH, "r") as f:
-            user_metadata = f.read().strip()
+            return f.read().strip()
     except FileNotFoundError:
         print("⚠️ Error: 'user_metadata.txt' file not found.")
-        return {}
+        return None
 
-    def generate_prompt(user_metadata: str, required_fields: list[FormField]) -> str:
-        prompt = "You are an AI assistant that helps fill job application forms based on user metadata.\n\n"
-        prompt += "Here is the user metadata:\n"
-        prompt += user_metadata + "\n\n"
-        prompt += "Based on the above metadata, suggest appropriate values for the following required fields:\n"
-
-        for field in required_fields:
-            prompt += f"- **Label:** {field.label}\n"
-            prompt += f"  - **Type:** {field.input_type}\n"
-            prompt += f"  - **Name:** {field.input_name}\n"
-            if field.options:
-                prompt += "  - **Options:**\n"
-                for option in field.options:
-                    prompt += f"    - **Label:** {option.option_label}, **Value:** {option.option_value}\n"
-
-        prompt += (
-            "\nPlease provide the suggested values in JSON format, like this:\n"
-            "```json\n"
-            "{\n"
-            '  "opportunityLocationId": "5ea282ab-de75-4861-bd77-8a303a3ec812",\n'
-            '  "resume": "resume.pdf",\n'
-            '  "name": "John Doe",\n'
-            '  "email": "johndoe@example.com",\n'
-            '  "phone": "+1 234-567-8901",\n'
-            '  "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field0]": "123 Main St, New York, NY"\n'
-            "}\n"
-            "```"
-        )
-        prompt += (
-            "\nEnsure that all fields are filled using the following rules:\n"
-            "- If the field is a **text** or **textarea**, fill it with `'Unspecified'` if no meaningful value is found.\n"
-            "- If the field is a **select**, **radio**, or **checkbox**, choose the **first available option** from the list.\n"
-            "- Do NOT leave any field empty.\n"
-            "- Return the result as a JSON object **without any explanations or extra text**."
-        )
-        return prompt
+def generate_prompt(user_metadata: str, required_fields: list[FormField]) -> str:
+    prompt = "You are an AI assistant that helps fill job application forms based on user metadata.\n\n"
+    prompt += "Here is the user metadata:\n"
+    prompt += user_metadata + "\n\n"
+    prompt += "Based on the above metadata, suggest appropriate values for the following required fields:\n"
+    prompt += describe_fields(required_fields)
 
-    # Generate the prompt
-    prompt = generate_prompt(user_metadata, required_fields)
-    logger.info(f"Prompt: {prompt}")
-
-    # Initialize OpenAI client
-    client = openai.OpenAI(api_key=api_key)
+    prompt += (
+        "\nPlease provide the suggested values in JSON format, like this:\n"
+        "```json\n"
+        "{\n"
+        '  "opportunityLocationId": "5ea282ab-de75-4861-bd77-8a303a3ec812",\n'
+        '  "resume": "resume.pdf",\n'
+        '  "name": "John Doe",\n'
+        '  "email": "johndoe@example.com",\n'
+        '  "phone": "+1 234-567-8901",\n'
+        '  "cards[084c182c-cccc-44f0-af81-18f2c91cf7db][field0]": "123 Main St, New York, NY"\n'
+        "}\n"
+        "```"
+    )
+    prompt += (
+        "\nEnsure that all fields are filled using the following rules:\n"
+        "- If the field is a **text** or **textarea**, fill it with `'Unspecified'` if no meaningful value is found.\n"
+        "- If the field is a **select**, **radio**, or **checkbox**, choose the **first available option** from the list.\n"
+        "- For a **select**, **radio**, or **checkbox**, answer with the option **Value**, exactly as listed.\n"
+        "- Do NOT leave any field empty.\n"
+        "- Return the result as a JSON object **without any explanations or extra text**."
+    )
+    return prompt
 
-    # Make API call to OpenAI
-    response = client.chat.completions.create(
-        model="gpt-4-turbo",
-        messages=[{"role": "system", "content": "You are a helpful assistant."},
-                  {"role": "user", "content": prompt}]
+def generate_reask_prompt(
+    user_metadata: str, invalid_fields: list[FormField], previous_values: dict, rejection_message: Optional[str] = None
+) -> str:
+    prompt = "You are an AI assistant that helps fill job application forms based on user metadata.\n\n"
+    prompt += "Here is the user metadata:\n"
+    prompt += user_metadata + "\n\n"
+    if rejection_message is None:
+        prompt += "Your previous answers for the following required fields were missing or not one of the allowed options:\n"
+    else:
+        prompt += "The application form rejected your previous answers for the following required fields"
+        prompt += f" with this error: {rejection_message}\n" if rejection_message else ":\n"
+    prompt += describe_fields(invalid_fields, previous_values)
+    prompt += (
+        "\nProvide corrected values for these fields only, as a JSON object keyed by field name.\n"
+        "- If the field is a **text** or **textarea**, fill it with `'Unspecified'` if no meaningful value is found.\n"
+        "- For a **select**, **radio**, or **checkbox**, answer with one option **Value**, exactly as listed.\n"
+        "- Return the result as a JSON object **without any explanations or extra text**."
     )
+    return prompt
+
+def describe_fields(fields: list[FormField], previous_values: Optional[dict] = None) -> str:
+    """
+    Describe form fields as a markdown list for a prompt.
+    
+    Args:
+        fields: List of form fields to describe
+        previous_values: Optional previous answers to include per field
+        
+    Returns:
+        str: The field descriptions
+    """
+    description = ""
+    for field in fields:
+        description += f"- **Label:** {field.label}\n"
+        description += f"  - **Type:** {field.input_type}\n"
+        description += f"  - **Name:** {field.input_name}\n"
+        if previous_values is not None:
+            description += f"  - **Previous answer:** {json.dumps(previous_values.get(field.input_name))}\n"
+        if field.options:
+            description += "  - **Options:**\n"
+            for option in field.options:
+                description += f"    - **Label:** {option.option_label}, **Value:** {option.option_value}\n"
+    return description
+
+def build_response_schema(fields: list[FormField]) -> dict:
+    """
+    Build a JSON schema for the answers to the given fields.
+    
+    Selection fields are constrained to their option values.
+    
+    Args:
+        fields: List of form fields to answer
+        
+    Returns:
+        dict: JSON schema for an object keyed by field name
+    """
+    properties = {}
+    for field in fields:
+        if field.is_selection and field.options:
+            properties[field.input_name] = {
+                "type": "string",
+                "enum": [option.option_value for option in field.options],
+            }
+        else:
+            properties[field.input_name] = {"type": "string"}
 
-    # Print the raw response for debugging
-    logging.info("🔍 Raw OpenAI Response:")
-    logging.info(response.choices[0].message.content)
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+def build_response_format(fields: list[FormField]) -> dict:
+    """
+    Build the response_format parameter for a completion answering the given fields.
+    
+    Args:
+        fields: List of form fields to answer
+        
+    Returns:
+        dict: A strict json_schema format, or plain JSON mode when structured outputs are disabled
+    """
+    if not OPENAI_STRUCTURED_OUTPUTS:
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "form_field_values",
+            "strict": True,
+            "schema": build_response_schema(fields),
+        },
+    }
+
+def validate_field_values(
+    fields: list[FormField], values: dict, option_indexes: dict[str, OptionIndex]
+) -> tuple[dict, list[FormField]]:
+    """
+    Check each answer against its field.
+    
+    Args:
+        fields: List of form fields that were asked about
+        values: Dictionary of field names to suggested values
+        option_indexes: Option indexes of the selection fields, keyed by field name
+        
+    Returns:
+        tuple[dict, list[FormField]]: The valid values, and the fields that are missing or invalid
+    """
+    valid_values: dict = {}
+    invalid_fields: list[FormField] = []
+
+    for field in fields:
+        value = values.get(field.input_name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+
+        if not isinstance(value, str) or not value.strip():
+            invalid_fields.append(field)
+        elif field.input_name in option_indexes:
+            # Near-miss answers are mapped locally rather than re-asked
+            matched = option_indexes[field.input_name].match(value)
+            if matched is None:
+                invalid_fields.append(field)
+            else:
+                valid_values[field.input_name] = matched
+        else:
+            valid_values[field.input_name] = value
+
+    return valid_values, invalid_fields
+
+def fallback_field_values(fields: list[FormField]) -> dict:
+    """
+    Apply the prompt's default rules to fields the model could not answer.
+    
+    Args:
+        fields: List of form fields still missing a valid value
+        
+    Returns:
+        dict: The first option for selection fields, 'Unspecified' for text fields
+    """
+    fallback_values = {}
+    for field in fields:
+        if field.is_selection:
+            value = field.get_first_option_value()
+        else:
+            value = "Unspecified"
+        if value:
+            logger.warning(f"Using fallback value for field {field.input_name}: {value}")
+            fallback_values[field.input_name] = value
+    return fallback_values
+
+async def _request_field_values(
+    user_metadata: str,
+    required_fields: list[FormField],
+    option_indexes: dict[str, OptionIndex],
+    previous_values: Optional[dict] = None,
+    rejection_message: Optional[str] = None,
+) -> tuple[dict, list[FormField]]:
+    """
+    Ask the model for values of the given fields.
+    
+    Answers are validated against each field, and only the missing or
+    invalid fields are re-asked in a small follow-up request.
+    
+    Args:
+        user_metadata: The contents of the user metadata file
+        required_fields: List of form fields to suggest values for
+        option_indexes: Option indexes of the selection fields, keyed by field name
+        previous_values: Answers the form rejected; the first request re-asks for them if given
+        rejection_message: The form's error message for the rejected answers
+        
+    Returns:
+        tuple[dict, list[FormField]]: The valid suggested values, and the fields still without one
+    """
+    backend = get_ai_backend()
 
-    # Extract and parse JSON response
-    suggested_values = response.choices[0].message.content.strip("```json").strip("```")
     try:
-        return json.loads(suggested_values)
-    except json.JSONDecodeError as e:
-        print(f"⚠️ JSON Decode Error: {e}")
-        return {}
+        if previous_values is None:
+            prompt = generate_prompt(user_metadata, required_fields)
+        else:
+            prompt = generate_reask_prompt(user_metadata, required_fields, previous_values, rejection_message)
+        values = await _ask_for_values(backend, prompt, required_fields)
+        suggested_values, invalid_fields = validate_field_values(required_fields, values, option_indexes)
+
+        for _ in range(OPENAI_REASK_ATTEMPTS):
+            if not invalid_fields:
+                break
+            logger.info(f"Re-asking for {len(invalid_fields)} missing or invalid fields")
+            prompt = generate_reask_prompt(user_metadata, invalid_fields, values)
+            values = await _ask_for_values(backend, prompt, invalid_fields)
+            corrected_values, invalid_fields = validate_field_values(invalid_fields, values, option_indexes)
+            suggested_values.update(corrected_values)
+    finally:
+        await backend.close()
+
+    return suggested_values, invalid_fields
+
+async def _ask_for_values(backend: AIBackend, prompt: str, fields: list[FormField]) -> dict:
+    """
+    Send a prompt and parse the JSON answer.
+    
+    Args:
+        backend: The AI backend to ask
+        prompt: The user prompt
+        fields: List of form fields the prompt asks about
+        
+    Returns:
+        dict: The parsed answer, or an empty dict if it is not valid JSON
+    """
+    logger.info(f"Asking for {len(fields)} fields ({len(prompt)} character prompt)")
+    payload_logger.debug("Prompt:\n%s", prompt)
+    messages = [{"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}]
+
+    content = await backend.complete(messages, build_response_format(fields))
+
+    logger.info(f"Received {len(content)} character response")
+    payload_logger.debug("Raw response:\n%s", content)
+
+    return parse_json_response(content)
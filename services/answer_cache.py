@@ -0,0 +1,161 @@
+"""
+SQLite-backed cache of answers to recurring application questions.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from config.settings import ANSWER_CACHE_PATH
+from models.form_models import FormField
+from services.form_parser import normalize_label
+
+logger = logging.getLogger(__name__)
+
+# Free-text answers such as cover letters depend on the posting, so they are
+# never reused across applications.
+UNCACHEABLE_INPUT_TYPES = {'input_file', 'textarea'}
+
+def hash_metadata(user_metadata: str) -> str:
+    """
+    Hash the user metadata so cached answers can be tied to it.
+
+    Args:
+        user_metadata: The contents of the user metadata file
+
+    Returns:
+        str: Hex digest of the metadata
+    """
+    return hashlib.sha256(user_metadata.encode("utf-8")).hexdigest()
+
+def question_key(field: FormField) -> str:
+    """
+    Build the cache key for a question, independent of the posting.
+
+    Args:
+        field: The form field to build the key for
+
+    Returns:
+        str: Hex digest of the normalized (label, input_type, option set) tuple
+    """
+    option_values = sorted(option.option_value for option in field.options)
+    key = json.dumps([normalize_label(field.label), field.input_type, option_values], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def is_cacheable(field: FormField) -> bool:
+    """Check if answers to the field can be reused across postings."""
+    return field.input_type not in UNCACHEABLE_INPUT_TYPES
+
+class AnswerCache:
+    """Answers keyed by normalized question, valid for one version of the user metadata."""
+
+    def __init__(self, metadata_hash: str, path: str = ANSWER_CACHE_PATH):
+        """
+        Open the cache and evict answers generated from other user metadata.
+
+        Args:
+            metadata_hash: Hash of the current user metadata
+            path: Path to the SQLite database
+        """
+        self.metadata_hash = metadata_hash
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "question_key TEXT PRIMARY KEY, "
+                "metadata_hash TEXT NOT NULL, "
+                "label TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            evicted = self.connection.execute(
+                "DELETE FROM answers WHERE metadata_hash != ?", (metadata_hash,)
+            ).rowcount
+        if evicted:
+            logger.info(f"Evicted {evicted} cached answers generated from outdated user metadata")
+
+    def __enter__(self) -> "AnswerCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.connection.close()
+
+    def lookup(self, fields: list[FormField]) -> dict:
+        """
+        Look up cached answers for the given fields.
+
+        Args:
+            fields: List of form fields to look up
+
+        Returns:
+            dict: Dictionary of field names to cached values for every hit
+        """
+        keys: dict[str, list[FormField]] = {}
+        for field in fields:
+            if is_cacheable(field):
+                keys.setdefault(question_key(field), []).append(field)
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        rows = self.connection.execute(
+            f"SELECT question_key, value FROM answers WHERE metadata_hash = ? AND question_key IN ({placeholders})",
+            (self.metadata_hash, *keys),
+        ).fetchall()
+
+        cached_values = {field.input_name: value for key, value in rows for field in keys[key]}
+        logger.info(f"Answer cache hits: {len(cached_values)}/{len(fields)}")
+        return cached_values
+
+    def forget(self, fields: list[FormField]):
+        """
+        Remove cached answers for the given fields, e.g. after the form rejected them.
+
+        Args:
+            fields: List of form fields whose answers should not be reused
+        """
+        keys = {question_key(field) for field in fields if is_cacheable(field)}
+        if not keys:
+            return
+
+        placeholders = ",".join("?" * len(keys))
+        with self.connection:
+            self.connection.execute(
+                f"DELETE FROM answers WHERE metadata_hash = ? AND question_key IN ({placeholders})",
+                (self.metadata_hash, *keys),
+            )
+
+    def store(self, fields: list[FormField], values: dict):
+        """
+        Store newly generated answers for the given fields.
+
+        Args:
+            fields: List of form fields the values were generated for
+            values: Dictionary of field names to values
+        """
+        now = time.time()
+        # Only plain string answers round-trip; lists or bools would come back as "['Yes']" or "True"
+        rows = [
+            (question_key(field), self.metadata_hash, field.label, values[field.input_name], now)
+            for field in fields
+            if is_cacheable(field) and isinstance(values.get(field.input_name), str) and values[field.input_name]
+        ]
+        if not rows:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO answers (question_key, metadata_hash, label, value, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Stored {len(rows)} answers in the answer cache")
@@ -0,0 +1,113 @@
+"""
+Shared Chromium process with a fresh browser context per attempt.
+"""
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from config.settings import HEADLESS, BROWSER_MAX_USES
+from utils.tracing import span, increment
+
+logger = logging.getLogger(__name__)
+
+# Chromium only honours per-context proxies when the browser was launched with
+# one; this placeholder is overridden by every context's own proxy
+PER_CONTEXT_PROXY = {"server": "http://per-context"}
+
+class BrowserManager:
+    """
+    Launches Chromium once and hands out isolated contexts.
+
+    The browser is relaunched after ``max_uses`` contexts, or when it has
+    crashed or disconnected, so a long run does not accumulate leaked memory.
+    """
+
+    def __init__(self, headless: bool = HEADLESS, max_uses: int = BROWSER_MAX_USES):
+        """
+        Args:
+            headless: Whether to run Chromium headless
+            max_uses: Number of contexts served before the browser is relaunched
+        """
+        self.headless = headless
+        self.max_uses = max_uses
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.uses = 0
+
+    async def __aenter__(self) -> "BrowserManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the browser is launched and still connected."""
+        return self.browser is not None and self.browser.is_connected()
+
+    async def get_browser(self) -> Browser:
+        """
+        Return the running browser, launching or recycling it first if needed.
+
+        Returns:
+            Browser: The Chromium browser
+        """
+        if self.browser is not None and not self.browser.is_connected():
+            logger.warning("Browser disconnected, relaunching")
+            await self._close_browser()
+        elif self.browser is not None and self.uses >= self.max_uses:
+            logger.info(f"Recycling browser after {self.uses} uses")
+            await self._close_browser()
+
+        if self.browser is None:
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            with span("browser_launch"):
+                self.browser = await self.playwright.chromium.launch(headless=self.headless, proxy=PER_CONTEXT_PROXY)
+            increment("browser_launches")
+            self.uses = 0
+        return self.browser
+
+    @asynccontextmanager
+    async def new_context(self, **options):
+        """
+        Open a fresh browser context and close it afterwards.
+
+        Args:
+            **options: Options passed to Browser.new_context; include a proxy,
+                since contexts without one fall back to the placeholder proxy
+
+        Yields:
+            BrowserContext: The new context
+        """
+        browser = await self.get_browser()
+        context: BrowserContext = await browser.new_context(**options)
+        self.uses += 1
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                # The browser may have crashed; the next attempt relaunches it
+                logger.warning(f"Failed to close browser context: {str(e)}")
+
+    async def _close_browser(self):
+        """Close the browser, ignoring errors from one that already crashed."""
+        browser, self.browser = self.browser, None
+        self.uses = 0
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser: {str(e)}")
+
+    async def close(self):
+        """Close the browser and stop the Playwright driver."""
+        if self.browser is not None:
+            await self._close_browser()
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
@@ -3,84 +3,197 @@ Browser and page handling services.
 """
 import logging
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from config.settings import TIMEOUT, APPLICATION_FORM_SELECTOR, HEADLESS
-from services.form_service import extract_form_fields, fill_form_fields, submit_application
-from services.ai_service import suggest_field_values
+from config.settings import (
+    TIMEOUT, APPLICATION_FORM_SELECTOR, SUBMIT_MAX_REFILLS, BLOCK_RESOURCES, REVEALED_QUESTION_ROUNDS
+)
+from services.form_service import (
+    extract_changed_fields, fill_form_fields, submit_application, upload_resume,
+    watch_form_questions
+)
+from services.ai_service import reask_rejected_values, suggest_field_values
+from services.browser_manager import BrowserManager
+from services.option_matcher import build_option_indexes, match_field_values
+from services.profile_service import resolve_profile_fields
+from services.resource_blocker import block_resources
+from services.schema_cache import extract_form_fields_cached
+from utils.logging_utils import get_payload_logger
+from utils.tracing import span, instrument_page
 
 logger = logging.getLogger(__name__)
+payload_logger = get_payload_logger()
 
-async def browse_with_proxy(proxy, url):
+async def resolve_field_values(fields):
     """
-    Launch browser with the given proxy and visit the specified URL.
+    Resolve standard fields from the profile and ask the AI service for the rest.
+    
+    Args:
+        fields: List of non-file form fields
+        
+    Returns:
+        dict: Dictionary of field names to values, with selection answers matched
+    """
+    # Built once and shared by answer validation and the final matching
+    option_indexes = build_option_indexes(fields)
+    suggested_values, unresolved_fields = resolve_profile_fields(fields)
+    if unresolved_fields:
+        suggested_values.update(await suggest_field_values(unresolved_fields, option_indexes))
+    
+    # Map selection answers onto existing option values before filling
+    return match_field_values(fields, suggested_values, option_indexes)
+
+@span("prepare_values")
+async def upload_resume_and_suggest_values(page, required_fields):
+    """
+    Upload the resume and generate field values concurrently.
+    
+    The upload and Lever's resume parse do not depend on the AI answers, so
+    they run alongside the AI request and both are joined before filling.
+    
+    Args:
+        page: The Playwright page object
+        required_fields: List of required form fields
+        
+    Returns:
+        dict: Dictionary of field names to suggested values
+    """
+    file_fields = [field for field in required_fields if field.is_file_input]
+    upload_task = asyncio.create_task(
+        asyncio.gather(*(upload_resume(page, field) for field in file_fields))
+    )
+    
+    try:
+        suggested_values = await resolve_field_values([field for field in required_fields if not field.is_file_input])
+        await upload_task
+    finally:
+        if not upload_task.done():
+            upload_task.cancel()
+    
+    return suggested_values
+
+async def fill_revealed_fields(page, remaining_fields, suggested_values):
+    """
+    Answer questions that appeared while the form was being filled.
+    
+    Each round extracts only the questions the form watcher reported, asks for
+    values for just those fields and fills them, until no new questions appear
+    or REVEALED_QUESTION_ROUNDS is reached.
+    
+    Args:
+        page: The Playwright page object
+        remaining_fields: The non-file fields filled so far; new fields are appended
+        suggested_values: Values filled so far; new values are added
+    """
+    for _ in range(REVEALED_QUESTION_ROUNDS):
+        known_names = {field.input_name for field in remaining_fields}
+        revealed_fields = [
+            field for field in await extract_changed_fields(page, known_names) if not field.is_file_input
+        ]
+        if not revealed_fields:
+            return
+        
+        revealed_values = await resolve_field_values(revealed_fields)
+        await fill_form_fields(page, revealed_fields, revealed_values)
+        remaining_fields.extend(revealed_fields)
+        suggested_values.update(revealed_values)
+    
+    logger.warning(f"Stopped looking for revealed questions after {REVEALED_QUESTION_ROUNDS} rounds")
+
+async def browse_with_proxy(proxy, url, browser_manager=None):
+    """
+    Visit the specified URL in a fresh browser context using the given proxy.
     
     Args:
         proxy: Dictionary with proxy configuration (server, username, password)
         url: The URL to visit
+        browser_manager: Shared BrowserManager; a temporary one is used if omitted
+        
+    Returns:
+        SubmissionOutcome: The outcome of the last submission
         
     Raises:
-        Exception: If there's an error during browser interaction
+        Exception: If there's an error during browser interaction before the
+            application is submitted; later errors are logged instead
     """
+    if browser_manager is None:
+        async with BrowserManager() as temporary_manager:
+            return await browse_with_proxy(proxy, url, temporary_manager)
+
     logger.info(f"Attempting to visit {url} using proxy: {proxy['server']}")
     
     try:
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=HEADLESS)
-            
-            # Create context with proxy
-            context = await browser.new_context(
-                proxy={
-                    "server": proxy["server"],
-                    "username": proxy["username"],
-                    "password": proxy["password"],
-                }
-            )
-            
-            page = await context.new_page()
+        # Create context with proxy
+        async with span("browse_with_proxy", proxy=proxy["server"]), browser_manager.new_context(
+            proxy={
+                "server": proxy["server"],
+                "username": proxy["username"],
+                "password": proxy["password"],
+            }
+        ) as context:
+            # Block analytics, heavy third-party hosts and static assets
+            if BLOCK_RESOURCES:
+                await block_resources(context)
 
-            # Block unnecessary resources
-            await page.route("**/*", lambda route, request:
-                route.abort() if request.resource_type in ["font", "image", "media"] else route.continue_())
+            page = instrument_page(await context.new_page())
 
             try:
                 # Navigate to the URL
-                response = await page.goto(url, timeout=TIMEOUT, wait_until="domcontentloaded")
-                
-                # Check response status
-                if response.status != 200:
-                    logger.error(f"Received non-200 status code ({response.status}) for {url}")
-                    raise Exception(f"HTTP {response.status} error accessing {url}")
+                with span("navigation"):
+                    response = await page.goto(url, timeout=TIMEOUT, wait_until="domcontentloaded")
+                    
+                    # Check response status
+                    if response.status != 200:
+                        logger.error(f"Received non-200 status code ({response.status}) for {url}")
+                        raise Exception(f"HTTP {response.status} error accessing {url}")
+                    
+                    # Wait for the application form to be visible
+                    await page.wait_for_selector(APPLICATION_FORM_SELECTOR, timeout=TIMEOUT)
+                    logger.info(f"Successfully found {APPLICATION_FORM_SELECTOR} on {url}")
                 
-
-                
-                # Wait for the application form to be visible
-                await page.wait_for_selector(APPLICATION_FORM_SELECTOR, timeout=TIMEOUT)
-                logger.info(f"Successfully found {APPLICATION_FORM_SELECTOR} on {url}")
+                # Extract form fields, reusing the cached schema if the form is unchanged
+                with span("form_schema") as schema_span:
+                    required_fields, cache_hit = await extract_form_fields_cached(page, url)
+                    schema_span.set(cache_hit=cache_hit)
                 
-                # Extract form fields
-                required_fields = await extract_form_fields(page)
-                
-                # Get suggested values for form fields
-                # In production, replace with actual AI service call
-                suggested_values = suggest_field_values(required_fields)
+                # Upload the resume while the field values are being generated
+                suggested_values = await upload_resume_and_suggest_values(page, required_fields)
                 
                 # Log suggested values
-                suggested_values_array = [{"key": k, "value": v} for k, v in suggested_values.items()]
-                logger.info(f"Suggested values: {suggested_values_array}")
+                logger.info(f"Suggested values for {len(suggested_values)} fields")
+                payload_logger.debug("Suggested values: %s", [{"key": k, "value": v} for k, v in suggested_values.items()])
 
-                # Fill the form fields
-                await fill_form_fields(page, required_fields, suggested_values)
+                # Fill the remaining form fields, then any questions the answers revealed
+                remaining_fields = [field for field in required_fields if not field.is_file_input]
+                await watch_form_questions(page)
+                await fill_form_fields(page, remaining_fields, suggested_values)
+                await fill_revealed_fields(page, remaining_fields, suggested_values)
+                
+                # Submit the application, re-filling only the fields Lever rejected
+                outcome = await submit_application(page)
+                try:
+                    for _ in range(SUBMIT_MAX_REFILLS):
+                        if not outcome.has_validation_errors:
+                            break
+                        rejected_fields = [field for field in remaining_fields if field.input_name in outcome.error_fields]
+                        if not rejected_fields:
+                            logger.warning(f"Rejected fields are not among the known fields: {outcome.error_fields}")
+                            break
+                        logger.info(f"Asking for new values for {len(rejected_fields)} rejected fields before resubmitting")
+                        suggested_values.update(
+                            await reask_rejected_values(rejected_fields, suggested_values, outcome.message)
+                        )
+                        await fill_form_fields(page, rejected_fields, suggested_values, overwrite=True)
+                        outcome = await submit_application(page)
+                except Exception as e:
+                    # The form was already submitted, so retrying with another proxy would apply twice
+                    logger.error(f"Re-filling rejected fields failed, keeping the last submission outcome: {str(e)}")
                 
-                # Submit the application
-                await submit_application(page)
+                return outcome
                 
             except PlaywrightTimeoutError:
                 logger.error(f"Timeout while trying to load {url} with proxy: {proxy}")
                 raise  # raise error to try a different proxy
-            finally:
-                await browser.close()
 
     except Exception as e:
         logger.error(f"Failed to use proxy {proxy}: {str(e)}")
@@ -3,14 +3,16 @@ Services for detecting and solving captchas.
 """
 import logging
 import ssl
-import aiohttp
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
 
 from config.settings import SOLVECAPTCHA_API_KEY, HCAPTCHA_SELECTORS
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
 logger = logging.getLogger(__name__)
 
-async def detect_and_solve_captcha(page: Page):
+async def detect_and_solve_captcha(page: "Page"):
     """
     Detect if a captcha is present and attempt to solve it.
     
@@ -65,7 +67,7 @@ async def detect_and_solve_captcha(page: Page):
         logger.error(f"Error in captcha detection: {str(e)}")
         return False
 
-async def solve_hcaptcha(page: Page, site_key: str, site_url: str) -> bool:
+async def solve_hcaptcha(page: "Page", site_key: str, site_url: str) -> bool:
     """
     Solve hCaptcha using SolveCaptcha service.
     
@@ -79,6 +81,9 @@ async def solve_hcaptcha(page: Page, site_key: str, site_url: str) -> bool:
     """
     logger.info(f"Attempting to solve hCaptcha with site key: {site_key}")
     
+    # Imported here so startup does not pay for aiohttp unless a captcha shows up
+    import aiohttp
+
     try:
         # Construct the API URL with query parameters
         base_url = "https://api.solvecaptcha.com/in.php"
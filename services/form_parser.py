@@ -0,0 +1,290 @@
+"""
+Browser-free parsing of saved Lever application pages.
+
+Mirrors the schema produced by EXTRACT_FORM_SCHEMA_JS in the form service so
+saved HTML snapshots yield the same FormField/Option models as a live page.
+"""
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Optional
+
+from config.settings import APPLICATION_FORM_SELECTOR
+from models.form_models import FormField, Option
+
+logger = logging.getLogger(__name__)
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Elements whose start tag implicitly closes an open sibling of the same kind
+SELF_CLOSING_SIBLINGS = {'li', 'option', 'p'}
+
+# Elements whose text never contributes to innerText
+NON_TEXT_ELEMENTS = {'script', 'style', 'template', 'noscript'}
+
+INLINE_DISPLAY_NONE = re.compile(r'(^|;)\s*display\s*:\s*none\b', re.IGNORECASE)
+
+class Node:
+    """A minimal DOM element built from parsed HTML."""
+
+    def __init__(self, tag: str, attrs: dict, parent: Optional["Node"] = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: list = []
+
+    @property
+    def classes(self) -> list[str]:
+        """Return the class tokens of the element."""
+        return self.attrs.get('class', '').split()
+
+    def get(self, name: str) -> Optional[str]:
+        """Return an attribute value, or None if it is not set."""
+        return self.attrs.get(name)
+
+    def iter(self):
+        """Yield all descendant elements in document order."""
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter()
+
+    def find(self, predicate) -> Optional["Node"]:
+        """Return the first descendant matching the predicate."""
+        return next((node for node in self.iter() if predicate(node)), None)
+
+    def find_all(self, predicate) -> list["Node"]:
+        """Return all descendants matching the predicate."""
+        return [node for node in self.iter() if predicate(node)]
+
+    def has_ancestor(self, tag: str, stop: "Node") -> bool:
+        """Check if the element has an ancestor with the given tag below stop."""
+        node = self.parent
+        while node is not None and node is not stop:
+            if node.tag == tag:
+                return True
+            node = node.parent
+        return False
+
+    def is_hidden(self) -> bool:
+        """
+        Check if the element or an ancestor is hidden by a hidden attribute or an inline display: none.
+
+        Stylesheets are not evaluated, so elements hidden by CSS classes count as visible.
+        """
+        node = self
+        while node is not None:
+            if 'hidden' in node.attrs or INLINE_DISPLAY_NONE.search(node.get('style') or ''):
+                return True
+            node = node.parent
+        return False
+
+    def text(self) -> str:
+        """Return the whitespace-collapsed text content of the element."""
+        parts: list[str] = []
+        self._collect_text(parts)
+        return collapse_whitespace(''.join(parts))
+
+    def _collect_text(self, parts: list[str]):
+        for child in self.children:
+            if isinstance(child, Node):
+                if child.tag not in NON_TEXT_ELEMENTS:
+                    child._collect_text(parts)
+                    if child.tag in ('br', 'div', 'p', 'li'):
+                        parts.append(' ')
+            else:
+                parts.append(child)
+
+class DocumentBuilder(HTMLParser):
+    """Build a Node tree from HTML, tolerating unclosed and stray tags."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document', {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SELF_CLOSING_SIBLINGS and self.stack[-1].tag == tag:
+            self.stack.pop()
+
+        node = Node(tag, {name: value or '' for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or '' for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of whitespace into single spaces and trim the result."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+def normalize_label(label: str) -> str:
+    """Lowercase a label and strip whitespace and trailing punctuation."""
+    return collapse_whitespace(label).rstrip('?:*.✱ ').lower()
+
+def parse_html(html: str) -> Node:
+    """
+    Parse an HTML document into a Node tree.
+
+    Args:
+        html: The HTML source
+
+    Returns:
+        Node: The document root
+    """
+    builder = DocumentBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def get_input_type(element: Node) -> str:
+    """
+    Determine the input type of an element.
+
+    Args:
+        element: The parsed element to check
+
+    Returns:
+        str: The determined input type
+    """
+    if element.tag in ('textarea', 'select'):
+        return element.tag
+    elif element.tag == 'input':
+        return f"input_{element.get('type') or 'text'}"
+    return 'unknown'
+
+def parse_form_schema(html: str, form_selector: str = APPLICATION_FORM_SELECTOR) -> list[dict]:
+    """
+    Extract the form schema from a saved application page.
+
+    Args:
+        html: The HTML source of the application page
+        form_selector: The id selector of the application form
+
+    Returns:
+        list[dict]: Schema entries with label, type, name, required and options keys
+
+    Raises:
+        ValueError: If the form selector is not an id selector
+    """
+    if not form_selector.startswith('#'):
+        raise ValueError(f"Only id selectors are supported, got: {form_selector}")
+
+    document = parse_html(html)
+    form_id = form_selector[1:]
+    form = document.find(lambda node: node.get('id') == form_id)
+    if form is None:
+        logger.warning(f"No element matching {form_selector} found in HTML")
+        return []
+
+    schema: list[dict] = []
+    questions = form.find_all(
+        lambda node: node.tag == 'li'
+        and 'application-question' in (node.get('class') or '')
+        and node.has_ancestor('ul', form)
+    )
+
+    for li in questions:
+        # Hidden questions are picked up by the form watcher once they are revealed
+        if li.is_hidden():
+            continue
+
+        label_wrapper = li.find(lambda node: node.tag == 'div' and 'application-label' in node.classes)
+        field_wrapper = li.find(lambda node: node.tag == 'div' and 'application-field' in node.classes)
+        if label_wrapper is None or field_wrapper is None:
+            continue
+
+        input_field = field_wrapper.find(lambda node: node.tag in ('input', 'textarea', 'select'))
+        if input_field is None:
+            continue
+
+        input_type = get_input_type(input_field)
+        input_name = input_field.get('name')
+        options: list[dict] = []
+
+        if input_type == 'select':
+            for option in input_field.find_all(lambda node: node.tag == 'option'):
+                value = option.get('value')
+                if value:
+                    options.append({"label": option.text(), "value": value.strip()})
+        elif input_type in ['input_radio', 'input_checkbox']:
+            choice_type = input_type.split('_')[1]
+            for choice in document.find_all(
+                lambda node: node.tag == 'input' and node.get('type') == choice_type and node.get('name') == input_name
+            ):
+                value = (choice.get('value') or '').strip()
+                options.append({"label": value, "value": value})
+
+        schema.append({
+            "label": label_wrapper.text().split('✱')[0].strip(),
+            "type": input_type,
+            "name": input_name,
+            "required": label_wrapper.find(lambda node: node.tag == 'span' and 'required' in node.classes) is not None,
+            "options": options,
+        })
+
+    return schema
+
+def fields_from_schema(schema: list[dict]) -> list[FormField]:
+    """
+    Build the required form fields from an extracted form schema.
+
+    Args:
+        schema: Schema entries with label, type, name, required and options keys
+
+    Returns:
+        list[FormField]: List of required form fields with their properties
+    """
+    required_fields: list[FormField] = []
+
+    for entry in schema:
+        if not entry.get("required"):
+            continue
+
+        options = [Option(option["label"], option["value"]) for option in entry.get("options", [])]
+        required_fields.append(FormField(entry["label"], entry["type"], entry["name"], options))
+
+        label = entry["label"]
+        truncated_label = (label[:20] + "...") if len(label) > 20 else label
+        logger.info(f"Required field found - Label: {truncated_label}, Type: {entry['type']}, Name: {entry['name']}")
+
+    return required_fields
+
+def parse_form_fields(html: str) -> list[FormField]:
+    """
+    Extract all required form fields from a saved application page.
+
+    Args:
+        html: The HTML source of the application page
+
+    Returns:
+        list[FormField]: List of required form fields with their properties
+    """
+    return fields_from_schema(parse_form_schema(html))
+
+def load_form_fields(path: str) -> list[FormField]:
+    """
+    Extract all required form fields from a saved application page on disk.
+
+    Args:
+        path: Path to the saved HTML file
+
+    Returns:
+        list[FormField]: List of required form fields with their properties
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_form_fields(f.read())
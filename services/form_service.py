@@ -1,147 +1,293 @@
 """
 Services for extracting and filling form fields.
 """
+import asyncio
 import logging
 import random
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
 
-from models.form_models import FormField, Option
+from models.form_models import FormField, SubmissionOutcome
 from utils.human_simulation import human_like_delay, human_like_typing
-from config.settings import APPLICATION_FORM_SELECTOR, SUBMIT_BUTTON_SELECTOR, RESUME_PATH
+from config.settings import (
+    APPLICATION_FORM_SELECTOR, SUBMIT_BUTTON_SELECTOR, SUBMIT_CONFIRMATION_SELECTOR, SUBMIT_ERROR_SELECTOR,
+    RESUME_PATH, BATCH_FILL_CHOICES, LOCATION_RESULTS_TIMEOUT, SUBMIT_RESPONSE_TIMEOUT, SUBMIT_CONFIRMATION_TIMEOUT
+)
 from services.captcha_service import detect_and_solve_captcha
+from services.form_parser import fields_from_schema
+from services.location_cache import load_cached_location, store_cached_location
+from utils.tracing import span
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
-async def get_input_type(element) -> str:
+# Walks the application form in the browser and returns one schema entry per
+# question, so the whole form is read in a single round trip. With onlyChanged,
+# only the questions reported by WATCH_FORM_QUESTIONS_JS since the last call are
+# read. Questions that are not rendered are skipped, so a question revealed
+# later shows up as a change. Keep in sync with parse_form_schema in
+# services/form_parser.py.
+EXTRACT_FORM_SCHEMA_JS = r'''
+({formSelector, onlyChanged}) => {
+    const form = document.querySelector(formSelector);
+    if (!form) {
+        return [];
+    }
+
+    let questions;
+    if (onlyChanged) {
+        const changed = window.__changedApplicationQuestions;
+        questions = changed ? Array.from(changed).filter((li) => li.isConnected && form.contains(li)) : [];
+        if (changed) {
+            changed.clear();
+        }
+    } else {
+        questions = Array.from(form.querySelectorAll('ul li[class*="application-question"]'));
+    }
+
+    const inputType = (el) => {
+        const tag = el.tagName.toLowerCase();
+        if (tag === 'textarea' || tag === 'select') {
+            return tag;
+        }
+        if (tag === 'input') {
+            return 'input_' + (el.getAttribute('type') || 'text');
+        }
+        return 'unknown';
+    };
+
+    const text = (el) => el.innerText.replace(/\s+/g, ' ').trim();
+
+    const schema = [];
+    questions.forEach((li) => {
+        // Hidden questions are picked up by the form watcher once they are revealed
+        if (li.getClientRects().length === 0) {
+            return;
+        }
+
+        const labelWrapper = li.querySelector('div.application-label');
+        const fieldWrapper = li.querySelector('div.application-field');
+        if (!labelWrapper || !fieldWrapper) {
+            return;
+        }
+
+        const input = fieldWrapper.querySelector('input, textarea, select');
+        if (!input) {
+            return;
+        }
+
+        const type = inputType(input);
+        const name = input.getAttribute('name');
+        const options = [];
+
+        if (type === 'select') {
+            input.querySelectorAll('option').forEach((option) => {
+                const value = option.getAttribute('value');
+                if (value) {
+                    options.push({label: text(option), value: value.trim()});
+                }
+            });
+        } else if (type === 'input_radio' || type === 'input_checkbox') {
+            const choiceType = type.split('_')[1];
+            document.querySelectorAll(`input[type="${choiceType}"]`).forEach((choice) => {
+                if (choice.getAttribute('name') === name) {
+                    const value = (choice.getAttribute('value') || '').trim();
+                    options.push({label: value, value: value});
+                }
+            });
+        }
+
+        schema.push({
+            label: text(labelWrapper).split('✱')[0].trim(),
+            type: type,
+            name: name,
+            required: !!labelWrapper.querySelector('span.required'),
+            options: options,
+        });
+    });
+    return schema;
+}
+'''
+
+@span("extract_form_fields")
+async def extract_form_fields(page) -> list[FormField]:
     """
-    Determine the input type of an element.
+    Extract all required form fields from the application form.
+    
+    The form is walked in a single page.evaluate call so extraction time does
+    not grow with the number of Playwright round trips per question.
     
     Args:
-        element: The Playwright element to check
+        page: The Playwright page object
         
     Returns:
-        str: The determined input type
+        list[FormField]: List of required form fields with their properties
     """
-    tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
+    logger.info("Extracting required form fields...")
+    schema = await page.evaluate(
+        EXTRACT_FORM_SCHEMA_JS, {"formSelector": APPLICATION_FORM_SELECTOR, "onlyChanged": False}
+    )
+    required_fields = fields_from_schema(schema)
     
-    if tag_name == 'textarea':
-        return 'textarea'
-    elif tag_name == 'select':
-        return 'select'
-    elif tag_name == 'input':
-        input_type = await element.get_attribute('type') or 'text'
-        return f'input_{input_type}'
-    return 'unknown'
-
-async def get_select_options(page, input_name: str) -> list[Option]:
+    logger.info(f"Found {len(required_fields)} required fields in total")
+    return required_fields
+
+# Records every question that is added to the form or whose visibility changes
+# in window.__changedApplicationQuestions, so questions revealed by an answer
+# can be read without rescanning the whole form
+WATCH_FORM_QUESTIONS_JS = '''
+(formSelector) => {
+    const form = document.querySelector(formSelector);
+    if (!form) {
+        return false;
+    }
+    if (window.__applicationQuestionObserver) {
+        return true;
+    }
+
+    const questionSelector = 'li[class*="application-question"]';
+    const changed = window.__changedApplicationQuestions = new Set();
+    const mark = (node) => {
+        const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+        if (!element) {
+            return;
+        }
+        const question = element.closest(questionSelector);
+        if (question) {
+            changed.add(question);
+        }
+        element.querySelectorAll(questionSelector).forEach((li) => changed.add(li));
+    };
+
+    const observer = new MutationObserver((records) => {
+        for (const record of records) {
+            if (record.type === 'childList') {
+                record.addedNodes.forEach(mark);
+            } else {
+                mark(record.target);
+            }
+        }
+    });
+    observer.observe(form, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        attributeFilter: ['style', 'class', 'hidden'],
+    });
+    window.__applicationQuestionObserver = observer;
+    return true;
+}
+'''
+
+async def watch_form_questions(page) -> bool:
     """
-    Extract all options from a select element given its name attribute.
+    Start recording questions that are added to or revealed in the form.
     
     Args:
         page: The Playwright page object
-        input_name: The name attribute of the select element
         
     Returns:
-        list[Option]: List of options in the select element
+        bool: True if the watcher is running
     """
-    logger.info(f"Extracting options for select element: {input_name}")
-    options: list[Option] = []
-    
-    # Query all option elements within the select
-    select_options = await page.query_selector_all(f'select[name="{input_name}"] option')
-    
-    for option in select_options:
-        # Skip the first option if it's a placeholder (value is usually empty)
-        value = await option.get_attribute('value')
-        if not value:
-            continue
-            
-        label = await option.inner_text()
-        options.append(Option(label.strip(), value.strip()))
-        logger.debug(f"Found option - Label: {label}, Value: {value}")
-    
-    logger.info(f"Found {len(options)} options for {input_name}")
-    return options
+    watching = await page.evaluate(WATCH_FORM_QUESTIONS_JS, APPLICATION_FORM_SELECTOR)
+    if not watching:
+        logger.warning("Application form not found, revealed questions will not be detected")
+    return watching
 
-async def get_choice_options(page, input_name: str, input_type: str) -> list[Option]:
+@span("extract_changed_fields")
+async def extract_changed_fields(page, known_names: set[str]) -> list[FormField]:
     """
-    Extract all options from a group of radio buttons or checkboxes given their name attribute.
+    Extract required fields from questions added or revealed since the last call.
     
     Args:
         page: The Playwright page object
-        input_name: The name attribute of the inputs
-        input_type: The type of the inputs (radio or checkbox)
+        known_names: Names of the fields that were already extracted
         
     Returns:
-        list[Option]: List of options in the group
+        list[FormField]: The new required fields
     """
-    logger.info(f"Extracting options for {input_type} group: {input_name}")
-    options: list[Option] = []
-    
-    # Escape special characters in the input name for the selector
-    escaped_name = input_name.replace('[', '\\[').replace(']', '\\]')
-    
-    # Query all inputs with the given name and type
-    inputs = await page.query_selector_all(f'input[type="{input_type}"][name="{escaped_name}"]')
-    
-    for input_el in inputs:
-        value = await input_el.get_attribute('value')
-        # Use the value as the label
-        options.append(Option(value.strip(), value.strip()))
-        logger.debug(f"Found {input_type} option - Label: {value}, Value: {value}")
-    
-    logger.info(f"Found {len(options)} options for {input_type} group {input_name}")
-    return options
+    schema = await page.evaluate(
+        EXTRACT_FORM_SCHEMA_JS, {"formSelector": APPLICATION_FORM_SELECTOR, "onlyChanged": True}
+    )
+    # Questions that only changed class or style after being answered are already known
+    new_fields = fields_from_schema([entry for entry in schema if entry["name"] not in known_names])
+    if new_fields:
+        logger.info(f"Found {len(new_fields)} newly revealed required fields")
+    return new_fields
 
-async def extract_form_fields(page) -> list[FormField]:
+# Sets every select/radio/checkbox value in one call and reports which ones
+# took effect. Clicking choices fires the same input/change events as a user.
+BATCH_FILL_CHOICES_JS = '''
+(entries) => {
+    const results = {};
+    for (const {name, type, value} of entries) {
+        try {
+            const elements = Array.from(document.getElementsByName(name));
+            if (type === 'select') {
+                const select = elements.find((el) => el.tagName.toLowerCase() === 'select');
+                if (!select || !Array.from(select.options).some((option) => option.value === value)) {
+                    results[name] = false;
+                    continue;
+                }
+                select.value = value;
+                select.dispatchEvent(new Event('input', {bubbles: true}));
+                select.dispatchEvent(new Event('change', {bubbles: true}));
+                results[name] = select.value === value;
+            } else {
+                const choiceType = type.split('_')[1];
+                const choice = elements.find((el) => el.type === choiceType && el.value === value);
+                if (!choice) {
+                    results[name] = false;
+                    continue;
+                }
+                if (!choice.checked) {
+                    choice.click();
+                }
+                results[name] = choice.checked;
+            }
+        } catch (e) {
+            results[name] = false;
+        }
+    }
+    return results;
+}
+'''
+
+@span("batch_fill_choice_fields")
+async def batch_fill_choice_fields(page: "Page", required_fields: list[FormField], suggested_values: dict) -> set[str]:
     """
-    Extract all required form fields from the application form.
+    Fill all select, radio and checkbox fields in a single page.evaluate call.
     
     Args:
         page: The Playwright page object
+        required_fields: List of form fields to fill
+        suggested_values: Dictionary of field names to values
         
     Returns:
-        list[FormField]: List of required form fields with their properties
+        set[str]: Names of the fields that were filled successfully
     """
-    logger.info("Extracting required form fields...")
-    form_selector = APPLICATION_FORM_SELECTOR
-    all_ul = await page.query_selector_all(f"{form_selector} ul")
-    required_fields: list[FormField] = []
+    entries = [
+        {"name": field.input_name, "type": field.input_type, "value": suggested_values[field.input_name]}
+        for field in required_fields
+        if field.is_selection and suggested_values.get(field.input_name)
+    ]
+    if not entries:
+        return set()
     
-    for ul in all_ul:
-        all_li = await ul.query_selector_all('li[class*="application-question"]')
-        for li in all_li:
-            # Get div with class="application-label"
-            application_label_wrapper = await li.query_selector("div.application-label")
-            required_field = await application_label_wrapper.query_selector("span.required")
-            
-            if required_field:
-                label = await application_label_wrapper.inner_text()
-                label = label.split('✱')[0].strip()
-                
-                # Detect the div.application-field under li
-                application_field = await li.query_selector("div.application-field")
-                if application_field:
-                    # Get the input field under the application_field
-                    input_field = await application_field.query_selector("input, textarea, select")
-                    if input_field:
-                        input_type = await get_input_type(input_field)
-                        input_name = await input_field.get_attribute("name")
-
-                        options = []
-                        if input_type == 'select':
-                            options = await get_select_options(page, input_name)
-                        elif input_type in ['input_radio', 'input_checkbox']:
-                            # Extract the actual input type (radio or checkbox)
-                            actual_type = input_type.split('_')[1]
-                            options = await get_choice_options(page, input_name, actual_type)
-                            
-                        required_fields.append(FormField(label, input_type, input_name, options))
-                        truncated_label = (label[:20] + "...") if len(label) > 20 else label
-                        logger.info(f"Required field found - Label: {truncated_label}, Type: {input_type}, Name: {input_name}")
+    try:
+        results = await page.evaluate(BATCH_FILL_CHOICES_JS, entries)
+    except Exception as e:
+        logger.error(f"Error batch filling choice fields: {str(e)}")
+        return set()
     
-    logger.info(f"Found {len(required_fields)} required fields in total")
-    return required_fields
+    filled_names = {name for name, success in results.items() if success}
+    for name, success in results.items():
+        if not success:
+            logger.warning(f"Batch fill failed for field {name}, falling back to individual fill")
+    
+    logger.info(f"Batch filled {len(filled_names)}/{len(entries)} choice fields")
+    return filled_names
 
 async def is_debounced_field(page, field):
     """
@@ -162,10 +308,63 @@ async def is_debounced_field(page, field):
     except Exception:
         return False
 
+# Lever's location search has settled: results or the no-results message are
+# shown and the loading indicator is gone
+LOCATION_RESULTS_SETTLED_JS = '''
+() => {
+    const isVisible = (selector) => {
+        const el = document.querySelector(selector);
+        return !!el && window.getComputedStyle(el).display !== 'none';
+    };
+    const hasResults = document.querySelectorAll('.dropdown-location').length > 0;
+    return (hasResults || isVisible('.dropdown-no-results')) && !isVisible('.dropdown-loading-results');
+}
+'''
+
+# Does what Lever's option handler does for the first result: sets the visible
+# input and the hidden #selected-location entry, then closes the dropdown
+SELECT_FIRST_LOCATION_JS = '''
+() => {
+    const option = document.querySelector('.dropdown-location');
+    if (!option || typeof searchedLocations === 'undefined' || !searchedLocations) {
+        return null;
+    }
+
+    const location = searchedLocations[parseInt(option.id.split('-')[1], 10)];
+    const text = option.textContent.trim();
+    document.querySelector('input.location-input').value = text;
+    document.querySelector('#selected-location').value = JSON.stringify(location);
+
+    document.querySelectorAll('.dropdown-container, .dropdown-no-results, .dropdown-loading-results')
+        .forEach((el) => { el.style.display = 'none'; });
+    document.querySelectorAll('.dropdown-results').forEach((el) => { el.innerHTML = ''; });
+    return {text: text, location: location};
+}
+'''
+
+# Applies a cached location selection without running the search: sets the
+# visible input and the hidden #selected-location entry
+APPLY_LOCATION_JS = '''
+([inputSelector, text, location]) => {
+    const input = document.querySelector(inputSelector);
+    const selectedLocation = document.querySelector('#selected-location');
+    if (!input || !selectedLocation) {
+        return false;
+    }
+    input.value = text;
+    selectedLocation.value = JSON.stringify(location);
+    return true;
+}
+'''
+
 async def handle_debounced_field(page, field, value):
     """
     Special handling for debounced fields like location inputs.
     
+    A location chosen for the same query on an earlier run is applied from the
+    location cache in one call; otherwise Lever's search runs and the chosen
+    result is cached.
+    
     Args:
         page: The Playwright page object
         field: The form field to fill
@@ -174,6 +373,19 @@ async def handle_debounced_field(page, field, value):
     from services.captcha_service import solve_hcaptcha
     
     logger.info(f"Handling debounced field: {field.input_name} with value: {value}")
+    element_selector = f'input[name="{field.escaped_name}"]'
+    
+    # A location chosen for the same query before is applied without searching
+    cached = load_cached_location(value)
+    if cached:
+        try:
+            if await page.evaluate(APPLY_LOCATION_JS, [element_selector, cached["text"], cached["location"]]):
+                logger.info(f"Applied cached location option: {cached['text']}")
+                # Move to the next field, as the live search path does
+                await page.press(element_selector, "Tab")
+                return
+        except Exception as e:
+            logger.warning(f"Could not apply cached location for {field.input_name}: {str(e)}")
     
     try:
         # 1. First solve hCaptcha if needed
@@ -200,7 +412,6 @@ async def handle_debounced_field(page, field, value):
                     logger.warning("Failed to pre-solve hCaptcha")
         
         # 2. Get the location input field
-        element_selector = f'input[name="{field.escaped_name}"]'
         element = await page.wait_for_selector(element_selector)
         
         if not element:
@@ -212,54 +423,23 @@ async def handle_debounced_field(page, field, value):
         await element.fill("")
         await human_like_typing(element, value)
         
-        # 4. Wait a fixed time for the debounce (500ms plus buffer)
-        await page.wait_for_timeout(700)
-        
-        # 5. Use basic JavaScript to trigger the search manually
-        await page.evaluate('''
-            () => {
-                if (typeof debouncedGetLocationResultsByInput === 'function') {
-                    debouncedGetLocationResultsByInput();
-                }
-            }
-        ''')
-        
-        # 6. Wait for results to load
-        await page.wait_for_timeout(5000)
-        
-        # 7. Check if any options are available and select the first one
-        has_options = await page.evaluate('''
-            () => {
-                const options = document.querySelectorAll('.dropdown-location');
-                return options.length > 0;
-            }
-        ''')
+        # 4. Wait for the debounced search to settle on results or no results
+        try:
+            await page.wait_for_function(LOCATION_RESULTS_SETTLED_JS, timeout=LOCATION_RESULTS_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Location search did not settle within {LOCATION_RESULTS_TIMEOUT}ms: {str(e)}")
         
-        if has_options:
-            logger.info("Found dropdown options, selecting first one")
-            
-            # Use direct jQuery click as in original code
-            success = await page.evaluate('''
-                () => {
-                    try {
-                        $('.dropdown-location:first').mousedown();
-                        return true;
-                    } catch (e) {
-                        console.error("Error clicking option:", e);
-                        return false;
-                    }
-                }
-            ''')
-            
-            if success:
-                logger.info("Successfully selected location option")
-            else:
-                logger.warning("Failed to select location option")
+        # 5. Select the first result the way Lever's click handler would
+        selected = await page.evaluate(SELECT_FIRST_LOCATION_JS)
+        if selected:
+            logger.info(f"Successfully selected location option: {selected['text']}")
+            # Without a searchedLocations entry there is nothing valid to replay
+            if selected.get("location") is not None:
+                store_cached_location(value, selected)
         else:
             logger.info("No location options found, using raw input")
         
-        # 8. Ensure we move to the next field
-        await page.wait_for_timeout(5000)
+        # 6. Move to the next field
         await element.press("Tab")
         
     except Exception as e:
@@ -272,151 +452,121 @@ async def handle_debounced_field(page, field, value):
                 await element.press("Tab")
         except Exception:
             pass
-    """
-    Special handling for debounced fields like location inputs with precise option selection.
-    """
-    from services.captcha_service import solve_hcaptcha
 
-    # Define the search delay matching the JavaScript value
-    SEARCH_DELAY = 500  # Milliseconds, matching the JS code
+@span("upload_resume")
+async def upload_resume(page: "Page", field: FormField):
+    """
+    Upload the resume to a file input and wait for Lever to parse it.
     
-    logger.info(f"Handling debounced field: {field.input_name} with value: {value}")
+    Lever's parse may auto-populate text fields; fill_form_fields leaves
+    those values untouched.
     
+    Args:
+        page: The Playwright page object
+        field: The file input field
+    """
     try:
-        # Pre-emptively solve hCaptcha
-        logger.info("Pre-emptively solving hCaptcha for location search...")
+        logger.info(f"Attempting to upload resume from: {RESUME_PATH}")
         
-        hcaptcha_input = await page.query_selector('#hcaptchaResponseInput')
+        # Escape special characters in the input name for the selector
+        escaped_name = field.escaped_name
+        file_input = await page.wait_for_selector(f'input[name="{escaped_name}"]')
         
-        if hcaptcha_input:
-            logger.info("Found hCaptcha response input field, attempting to solve...")
-            
-            site_key = await page.evaluate('''
-                () => {
-                    const hcaptchaDiv = document.querySelector('div#h-captcha.h-captcha');
-                    return hcaptchaDiv ? hcaptchaDiv.getAttribute('data-sitekey') : null;
-                }
-            ''')
-            
-            if site_key:
-                logger.info(f"Found hCaptcha site key: {site_key}")
-                captcha_solved = await solve_hcaptcha(page, site_key, page.url)
-                
-                if captcha_solved:
-                    logger.info("Successfully pre-solved hCaptcha")
-                    await page.wait_for_timeout(1000)
-                else:
-                    logger.warning("Failed to pre-solve hCaptcha")
+        if file_input:
+            # Start listening before the upload so a fast parse response is not missed
+            try:
+                with span("resume_parse"):
+                    async with page.expect_response(
+                        lambda response: 'parseResume' in response.url,
+                        timeout=30000  # 30 seconds timeout
+                    ) as response_info:
+                        await file_input.set_input_files(RESUME_PATH)
+                        logger.info(f"Successfully uploaded resume for field: {field.input_name}")
+                    await response_info.value
+                logger.info("Resume parsing completed successfully")
+            except Exception as e:
+                logger.error(f"Error waiting for resume parsing: {str(e)}")
         
-        # Interact with location field
-        element_selector = f'input[name="{field.escaped_name}"]'
+    except Exception as e:
+        logger.error(f"Error uploading resume for field {field.input_name}: {str(e)}")
+
+async def fill_form_field(page: "Page", field: FormField, value, overwrite: bool = False):
+    """
+    Fill a single form field with its suggested value.
+    
+    Args:
+        page: The Playwright page object
+        field: The form field to fill
+        value: The suggested value, or None if there is none
+        overwrite: Replace a text value that is already present
+    """
+    # Add human-like delay between fields
+    await human_like_delay(page)
+
+    # Handle file inputs
+    if field.is_file_input:
+        await upload_resume(page, field)
+        return
+
+    if not value:
+        logger.warning(f"No suggested value found for field: {field.input_name}")
+        return
+
+    logger.info(f"Filling field '{field.input_name}' with value: {value}")
+
+    try:
+        # Check if field is a debounced field (location input)
+        if await is_debounced_field(page, field):
+            logger.info(f"Detected debounced field: {field.input_name}")
+            await handle_debounced_field(page, field, value)
+            return
+
+        # Determine the appropriate selector based on field type
+        element_selector = (
+            f'textarea[name="{field.input_name}"]' if field.input_type == 'textarea'
+            else f'select[name="{field.input_name}"]' if field.input_type == 'select'
+            else f'input[name="{field.input_name}"]'
+        )
+
+        # Wait for the element to be available
         element = await page.wait_for_selector(element_selector)
-        
         if not element:
-            logger.warning(f"Element not found for debounced field: {field.input_name}")
+            logger.warning(f"Element not found for field: {field.input_name}")
             return
-        
+
+        # Scroll element into view before interacting
         await element.scroll_into_view_if_needed()
-        
-        # Clear and fill the field
-        await element.fill("")
-        await human_like_typing(element, value)
-        
-        # Wait for the debounce delay
-        logger.info(f"Waiting for debounce delay ({SEARCH_DELAY}ms)...")
-        await page.wait_for_timeout(800)  # Wait a bit longer than the actual delay to be safe
-        
-        # Wait for dropdown to become visible
-        try:
-            logger.info("Waiting for dropdown to appear...")
-            dropdown_visible = await page.wait_for_function('''
-                () => {
-                    const container = document.querySelector('.dropdown-container');
-                    return container && window.getComputedStyle(container).display !== 'none';
-                }
-            ''', timeout=6000)
-            
-            if dropdown_visible:
-                logger.info("Dropdown appeared")
-                
-                # Wait for options to load (wait for AJAX completion)
-                await page.wait_for_function('''
-                    () => {
-                        // Either options have loaded or the "no results" message is shown
-                        return document.querySelectorAll('.dropdown-location').length > 0 || 
-                               (document.querySelector('.dropdown-no-results') && 
-                                window.getComputedStyle(document.querySelector('.dropdown-no-results')).display !== 'none');
-                    }
-                ''', timeout=5000)
-                
-                # Check if we have any options
-                options_count = await page.evaluate('''
-                    () => document.querySelectorAll('.dropdown-location').length
-                ''')
-                
-                logger.info(f"Found {options_count} location options")
-                
-                if options_count > 0:
-                    # Get the first option details
-                    first_option = await page.evaluate('''
-                        () => {
-                            const option = document.querySelector('.dropdown-location');
-                            if (option) {
-                                return {
-                                    id: option.id,
-                                    text: option.textContent,
-                                    index: option.id.split('-')[1]
-                                };
-                            }
-                            return null;
-                        }
-                    ''')
-                    
-                    if first_option:
-                        logger.info(f"First option: {first_option}")
-                        
-                        # Instead of clicking, which may be unreliable, execute the exact same actions 
-                        # that the JavaScript event handler would do
-                        await page.evaluate(f'''
-                            () => {{
-                                // Get the searchedLocations array (should be populated by now)
-                                if (typeof searchedLocations !== 'undefined' && searchedLocations) {{
-                                    // Hide dropdown
-                                    $('.dropdown-container').css({{ display: 'none' }});
-                                    
-                                    // Set input value
-                                    $('input.location-input').val('{first_option["text"]}');
-                                    
-                                    // Set hidden selected-location field
-                                    const selectedIndex = {first_option["index"]};
-                                    $('#selected-location').val(JSON.stringify(searchedLocations[selectedIndex]));
-                                    
-                                    // Empty dropdown
-                                    $('.dropdown-results').empty();
-                                    $('.dropdown-no-results').css({{ display: 'none' }});
-                                    $('.dropdown-loading-results').css({{ display: 'none' }});
-                                }}
-                            }}
-                        ''')
-                        
-                        logger.info("Successfully selected location using JavaScript handlers")
-                    else:
-                        logger.warning("Could not get details of the first option")
-                else:
-                    logger.warning("No options found in dropdown")
+
+        # Check current value only for text inputs and textareas
+        if field.is_text_input and not overwrite:
+            current_value = await element.input_value()
+            if current_value.strip():
+                logger.info(f"Field '{field.input_name}' already has value: {current_value}. Skipping...")
+                return
+
+        # Handle different input types
+        if field.input_type == 'textarea':
+            await human_like_typing(element, value)
+
+        elif field.input_type == 'select':
+            await page.select_option(f'select[name="{field.input_name}"]', value)
+
+        elif field.input_type.startswith('input_'):
+            input_type = field.input_type.split('_')[1]
+            if input_type in ['radio', 'checkbox']:
+                escaped_name = field.escaped_name
+                await page.check(f'input[type="{input_type}"][name="{escaped_name}"][value="{value}"]')
             else:
-                logger.warning("Dropdown did not appear")
-        
-        except Exception as e:
-            logger.error(f"Error handling dropdown: {str(e)}")
-            # Fallback - just use the raw value
-            await element.press("Tab")
-            logger.info("Using raw input value as fallback")
-        
+                # For text inputs, type more naturally with random delays
+                await human_like_typing(element, value)
+
     except Exception as e:
-        logger.error(f"Error handling debounced field {field.input_name}: {str(e)}")
+        logger.error(f"Error filling field {field.input_name}: {str(e)}")
 
-async def fill_form_fields(page: Page, required_fields: list[FormField], suggested_values: dict):
+@span("fill_form_fields")
+async def fill_form_fields(
+    page: "Page", required_fields: list[FormField], suggested_values: dict, overwrite: bool = False
+):
     """
     Fill form fields with suggested values.
     
@@ -424,105 +574,186 @@ async def fill_form_fields(page: Page, required_fields: list[FormField], suggest
         page: The Playwright page object
         required_fields: List of form fields to fill
         suggested_values: Dictionary of field names to values
+        overwrite: Replace text values that are already present, e.g. when re-filling rejected fields
     """
     logger.info("Starting to fill form fields...")
     
+    # Set choice fields in one round trip; failures fall through to the per-field path below
+    batch_filled = set()
+    if BATCH_FILL_CHOICES:
+        batch_filled = await batch_fill_choice_fields(page, required_fields, suggested_values)
+    
     for field in required_fields:
-        # Add human-like delay between fields
-        await human_like_delay(page)
+        if field.input_name in batch_filled:
+            continue
+        
+        with span("fill_field", name=field.input_name, type=field.input_type):
+            await fill_form_field(page, field, suggested_values.get(field.input_name), overwrite)
+
+    logger.info("Form filling completed.")
+
+def is_submit_response(response) -> bool:
+    """Check if a response is the application form POST."""
+    return response.request.method == "POST" and "/apply" in response.url
+
+# Marks the error messages left over from a previous attempt, so they do not
+# count as the result of the next one
+MARK_STALE_ERRORS_JS = '''
+(errorSelector) => {
+    document.querySelectorAll(errorSelector).forEach((el) => {
+        if (el.getClientRects().length > 0) {
+            el.dataset.staleSubmissionError = el.innerText.trim();
+        }
+    });
+}
+'''
+
+# The submission has finished: Lever's confirmation or a new error message is shown
+SUBMISSION_SETTLED_JS = '''
+([confirmationSelector, errorSelector]) => {
+    // Hidden message templates are in the DOM before submitting; only rendered ones count
+    const isRendered = (el) => el.getClientRects().length > 0;
+    const isStale = (el) => el.dataset.staleSubmissionError === el.innerText.trim();
+    const rendered = (selector) => Array.from(document.querySelectorAll(selector)).some(isRendered);
+    const renderedErrors = Array.from(document.querySelectorAll(errorSelector))
+        .some((el) => isRendered(el) && !isStale(el));
+    return rendered(confirmationSelector)
+        || renderedErrors
+        || window.location.pathname.endsWith('/thanks');
+}
+'''
+
+# Classifies the page after submitting: Lever's confirmation, or the error
+# messages and the names of the fields they belong to
+DETECT_SUBMISSION_OUTCOME_JS = r'''
+([formSelector, confirmationSelector, errorSelector]) => {
+    // Hidden message templates are in the DOM before submitting; only rendered ones count
+    const isRendered = (el) => el.getClientRects().length > 0;
+    const confirmation = Array.from(document.querySelectorAll(confirmationSelector)).find(isRendered);
+    if (confirmation || window.location.pathname.endsWith('/thanks')) {
+        return {status: 'success', fields: [], message: confirmation ? confirmation.innerText.trim() : ''};
+    }
+
+    const form = document.querySelector(formSelector);
+    if (!form) {
+        return {status: 'unknown', fields: [], message: ''};
+    }
+
+    const fields = new Set();
+    const addFields = (root) => {
+        root.querySelectorAll('input[name], textarea[name], select[name]').forEach((el) => {
+            if (el.type !== 'hidden') {
+                fields.add(el.name);
+            }
+        });
+    };
+
+    form.querySelectorAll('[aria-invalid="true"][name]').forEach((el) => fields.add(el.name));
+    form.querySelectorAll('li[class*="application-question"]').forEach((li) => {
+        if (/\berror\b/.test(li.className)) {
+            addFields(li);
+        }
+    });
+
+    const messages = [];
+    document.querySelectorAll(errorSelector).forEach((el) => {
+        const text = isRendered(el) ? el.innerText.trim() : '';
+        if (!text) {
+            return;
+        }
+        messages.push(text);
+        const question = el.closest('li[class*="application-question"]');
+        if (question) {
+            addFields(question);
+        }
+    });
+
+    if (fields.size || messages.length) {
+        return {status: 'validation_error', fields: Array.from(fields), message: messages.join(' ')};
+    }
+    return {status: 'unknown', fields: [], message: ''};
+}
+'''
+
+async def detect_submission_outcome(page: "Page") -> SubmissionOutcome:
+    """
+    Classify the submission result in a single in-page call.
+    
+    Args:
+        page: The Playwright page object
         
-        # Handle file inputs
-        if field.is_file_input:
+    Returns:
+        SubmissionOutcome: Success, validation errors with the offending field names, or unknown
+    """
+    args = [APPLICATION_FORM_SELECTOR, SUBMIT_CONFIRMATION_SELECTOR, SUBMIT_ERROR_SELECTOR]
+    try:
+        result = await page.evaluate(DETECT_SUBMISSION_OUTCOME_JS, args)
+    except Exception as e:
+        if "Execution context was destroyed" not in str(e):
+            raise
+        # The submission navigated while the old document was being read
+        logger.info("Page navigated during outcome detection, reading the new document")
+        await page.wait_for_load_state("domcontentloaded")
+        result = await page.evaluate(DETECT_SUBMISSION_OUTCOME_JS, args)
+    return SubmissionOutcome(result["status"], result["fields"], result["message"])
+
+async def wait_for_submission(page: "Page", submit_response: asyncio.Future, document_loaded: asyncio.Future):
+    """
+    Wait until the page shows the submission result.
+    
+    The submission response and the rendered result are awaited together, so a
+    submission that never POSTs (client-side validation or an unsolved captcha)
+    only costs the settle timeout. The response wait is cancelled once the page
+    has settled; a response arriving first is followed by the settle wait, and
+    by the new document when the response navigates.
+    
+    Args:
+        page: The Playwright page object
+        submit_response: Pending wait for the form POST response
+        document_loaded: Pending wait for the next domcontentloaded event
+    """
+    settled = asyncio.ensure_future(
+        page.wait_for_function(
+            SUBMISSION_SETTLED_JS,
+            arg=[SUBMIT_CONFIRMATION_SELECTOR, SUBMIT_ERROR_SELECTOR],
+            timeout=SUBMIT_CONFIRMATION_TIMEOUT
+        )
+    )
+    
+    try:
+        done, _ = await asyncio.wait({submit_response, settled}, return_when=asyncio.FIRST_COMPLETED)
+        if submit_response in done:
             try:
-                logger.info(f"Attempting to upload resume from: {RESUME_PATH}")
-                
-                # Escape special characters in the input name for the selector
-                escaped_name = field.escaped_name
-                file_input = await page.wait_for_selector(f'input[name="{escaped_name}"]')
-                
-                if file_input:
-                    await file_input.set_input_files(RESUME_PATH)
-                    logger.info(f"Successfully uploaded resume for field: {field.input_name}")
-                    
-                    # Wait for the resume parsing request to complete
+                response = submit_response.result()
+                logger.info(f"Submission response received with status {response.status}")
+            except Exception as e:
+                logger.warning(f"No submission response within {SUBMIT_RESPONSE_TIMEOUT}ms: {str(e)}")
+            else:
+                if response.request.is_navigation_request():
                     try:
-                        async with page.expect_response(
-                            lambda response: 'parseResume' in response.url,
-                            timeout=30000  # 30 seconds timeout
-                        ) as response_info:
-                            await response_info.value
-                        logger.info("Resume parsing completed successfully")
+                        await document_loaded
                     except Exception as e:
-                        logger.error(f"Error waiting for resume parsing: {str(e)}")
-                
-            except Exception as e:
-                logger.error(f"Error uploading resume for field {field.input_name}: {str(e)}")
-            continue
-
-        value = suggested_values.get(field.input_name)
-        if not value:
-            logger.warning(f"No suggested value found for field: {field.input_name}")
-            continue
-
-        logger.info(f"Filling field '{field.input_name}' with value: {value}")
+                        logger.warning(f"Document after the submission did not load: {str(e)}")
         
         try:
-            # Check if field is a debounced field (location input)
-            if await is_debounced_field(page, field):
-                logger.info(f"Detected debounced field: {field.input_name}")
-                await handle_debounced_field(page, field, value)
-                continue
-            
-            # Determine the appropriate selector based on field type
-            element_selector = (
-                f'textarea[name="{field.input_name}"]' if field.input_type == 'textarea'
-                else f'select[name="{field.input_name}"]' if field.input_type == 'select'
-                else f'input[name="{field.input_name}"]'
-            )
-            
-            # Wait for the element to be available
-            element = await page.wait_for_selector(element_selector)
-            if not element:
-                logger.warning(f"Element not found for field: {field.input_name}")
-                continue
-
-            # Scroll element into view before interacting
-            await element.scroll_into_view_if_needed()
-            
-            # Check current value only for text inputs and textareas
-            if field.is_text_input:
-                current_value = await element.input_value()
-                if current_value.strip():
-                    logger.info(f"Field '{field.input_name}' already has value: {current_value}. Skipping...")
-                    continue
-            
-            # Handle different input types
-            if field.input_type == 'textarea':
-                await human_like_typing(element, value)
-            
-            elif field.input_type == 'select':
-                await page.select_option(f'select[name="{field.input_name}"]', value)
-            
-            elif field.input_type.startswith('input_'):
-                input_type = field.input_type.split('_')[1]
-                if input_type in ['radio', 'checkbox']:
-                    escaped_name = field.escaped_name
-                    await page.check(f'input[type="{input_type}"][name="{escaped_name}"][value="{value}"]')
-                else:
-                    # For text inputs, type more naturally with random delays
-                    await human_like_typing(element, value)
-            
+            await settled
         except Exception as e:
-            logger.error(f"Error filling field {field.input_name}: {str(e)}")
-
-    logger.info("Form filling completed.")
+            logger.warning(f"No confirmation or error shown within {SUBMIT_CONFIRMATION_TIMEOUT}ms: {str(e)}")
+    finally:
+        for wait in (submit_response, document_loaded, settled):
+            if not wait.done():
+                wait.cancel()
 
-async def submit_application(page: Page):
+@span("submit_application")
+async def submit_application(page: "Page") -> SubmissionOutcome:
     """
     Click the submit application button and handle any captchas.
     
     Args:
         page: The Playwright page object
+        
+    Returns:
+        SubmissionOutcome: The classified result of the submission
     """
     logger.info("Attempting to submit application...")
     
@@ -530,37 +761,42 @@ async def submit_application(page: Page):
         # Find and click the submit button
         submit_button = await page.wait_for_selector(SUBMIT_BUTTON_SELECTOR, timeout=5000)
         if submit_button:
-            await submit_button.click()
-            logger.info("Submit button clicked successfully")
-            
-            # Check for captcha and try to solve it
-            await detect_and_solve_captcha(page)
+            # Errors still shown from a previous attempt must not settle this one
+            await page.evaluate(MARK_STALE_ERRORS_JS, SUBMIT_ERROR_SELECTOR)
             
-            # Wait for submission to complete
-            logger.info("Waiting for submission to complete (10 seconds)")
-            await page.wait_for_timeout(10000)  # Wait for 10 seconds
+            # Listen for the form POST and the document it may navigate to before
+            # clicking so neither can be missed
+            submit_response = asyncio.ensure_future(
+                page.wait_for_event("response", predicate=is_submit_response, timeout=SUBMIT_RESPONSE_TIMEOUT)
+            )
+            document_loaded = asyncio.ensure_future(
+                page.wait_for_event("domcontentloaded", timeout=SUBMIT_RESPONSE_TIMEOUT)
+            )
             
-            # Check for success indicators
-            # This could be customized based on the specific confirmation patterns
-            success_indicators = [
-                "thank you",
-                "application received",
-                "application submitted",
-                "confirmation"
-            ]
+            try:
+                await submit_button.click()
+                logger.info("Submit button clicked successfully")
+                
+                # Check for captcha and try to solve it
+                await detect_and_solve_captcha(page)
+            except Exception:
+                submit_response.cancel()
+                document_loaded.cancel()
+                raise
             
-            for indicator in success_indicators:
-                has_indicator = await page.evaluate(f'''
-                    document.body.innerText.toLowerCase().includes('{indicator}')
-                ''')
-                if has_indicator:
-                    logger.info(f"Success indicator found: '{indicator}'")
-                    logger.info("Application successfully submitted")
-                    return True
+            # Wait for submission to complete
+            logger.info("Waiting for the submission to settle...")
+            await wait_for_submission(page, submit_response, document_loaded)
             
-            logger.warning("No success indicators found, submission status unclear")
-            return False
+            outcome = await detect_submission_outcome(page)
+            if outcome.is_success:
+                logger.info("Application successfully submitted")
+            elif outcome.has_validation_errors:
+                logger.warning(f"Submission rejected, invalid fields: {outcome.error_fields} ({outcome.message})")
+            else:
+                logger.warning("No success indicators found, submission status unclear")
+            return outcome
             
     except Exception as e:
         logger.error(f"Error submitting application: {str(e)}")
-        return False
\ No newline at end of file
+    return SubmissionOutcome(SubmissionOutcome.UNKNOWN)
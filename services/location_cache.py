@@ -0,0 +1,61 @@
+"""
+On-disk cache of location search results chosen for a query.
+"""
+import json
+import logging
+import os
+import re
+from typing import Optional
+
+from config.settings import LOCATION_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+def normalize_query(query: str) -> str:
+    """Lowercase a location query and collapse its whitespace."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+def _load_entries() -> dict:
+    """Read every cached location, or an empty dict if the cache is missing or unreadable."""
+    try:
+        with open(LOCATION_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable location cache {LOCATION_CACHE_PATH}: {str(e)}")
+        return {}
+
+def load_cached_location(query: str) -> Optional[dict]:
+    """
+    Look up the location chosen earlier for a query.
+
+    Args:
+        query: The text typed into the location input
+
+    Returns:
+        Optional[dict]: The option text and searchedLocations entry, or None on a miss
+    """
+    entry = _load_entries().get(normalize_query(query))
+    if not isinstance(entry, dict) or "text" not in entry or entry.get("location") is None:
+        return None
+    return entry
+
+def store_cached_location(query: str, selected: dict):
+    """
+    Remember the location chosen for a query.
+
+    Args:
+        query: The text typed into the location input
+        selected: The option text and searchedLocations entry that were selected
+    """
+    entries = _load_entries()
+    entries[normalize_query(query)] = {"text": selected["text"], "location": selected["location"]}
+    try:
+        os.makedirs(os.path.dirname(LOCATION_CACHE_PATH) or ".", exist_ok=True)
+        tmp_path = f"{LOCATION_CACHE_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, LOCATION_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"Could not write location cache {LOCATION_CACHE_PATH}: {str(e)}")
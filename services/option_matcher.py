@@ -0,0 +1,136 @@
+"""
+Local matching of free-form answers to the options of selection fields.
+"""
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Optional
+
+from models.form_models import FormField
+
+logger = logging.getLogger(__name__)
+
+# Minimum similarity score for a fuzzy match to be accepted
+MATCH_THRESHOLD = 0.5
+
+# Common answer variants mapped onto the tokens used by Lever options. Words that
+# can stand for an option of their own, like "none" or the "n" of "N/A", are
+# deliberately not mapped to "no".
+TOKEN_SYNONYMS = {
+    "y": "yes",
+    "true": "yes",
+    "yeah": "yes",
+    "false": "no",
+}
+
+def normalize(text: str) -> str:
+    """Lowercase text and reduce it to space-separated alphanumeric words."""
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+def stem(token: str) -> str:
+    """Strip a plural or third-person 's' so 'requires' matches 'require'."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> frozenset[str]:
+    """Split text into normalized tokens with synonyms applied."""
+    return frozenset(stem(TOKEN_SYNONYMS.get(token, token)) for token in normalize(text).split())
+
+class OptionIndex:
+    """Precomputed lookup tables for matching answers to one field's options."""
+
+    def __init__(self, field: FormField):
+        self.field = field
+        self.values = {option.option_value for option in field.options}
+        self.exact: dict[str, str] = {}
+        self.candidates: list[tuple[frozenset[str], str, str]] = []
+
+        # Values take precedence over labels when both normalize to the same text
+        for option in field.options:
+            for text in (option.option_label, option.option_value):
+                self.exact.setdefault(normalize(text), option.option_value)
+                self.candidates.append((tokenize(text), normalize(text), option.option_value))
+
+    def match(self, answer: str) -> Optional[str]:
+        """
+        Map an answer to the closest option value.
+
+        Args:
+            answer: The suggested answer
+
+        Returns:
+            Optional[str]: The matched option value, or None if nothing is close enough
+        """
+        if answer in self.values:
+            return answer
+
+        normalized = normalize(answer)
+        if normalized in self.exact:
+            return self.exact[normalized]
+
+        tokens = tokenize(answer)
+        best_value, best_score = None, 0.0
+        for option_tokens, option_text, value in self.candidates:
+            score = self._similarity(tokens, normalized, option_tokens, option_text)
+            if score > best_score:
+                best_value, best_score = value, score
+
+        return best_value if best_score >= MATCH_THRESHOLD else None
+
+    @staticmethod
+    def _similarity(tokens: frozenset[str], text: str, option_tokens: frozenset[str], option_text: str) -> float:
+        """Score token overlap, falling back to character similarity when no tokens are shared."""
+        if tokens and option_tokens:
+            shared = len(tokens & option_tokens)
+            if shared:
+                jaccard = shared / len(tokens | option_tokens)
+                containment = shared / min(len(tokens), len(option_tokens))
+                return (jaccard + containment) / 2
+        return SequenceMatcher(None, text, option_text).ratio() * 0.8
+
+def build_option_indexes(fields: list[FormField]) -> dict[str, OptionIndex]:
+    """
+    Precompute option indexes for every selection field.
+
+    Args:
+        fields: List of form fields
+
+    Returns:
+        dict[str, OptionIndex]: Option indexes keyed by field name
+    """
+    return {field.input_name: OptionIndex(field) for field in fields if field.is_selection and field.options}
+
+def match_field_values(
+    fields: list[FormField], values: dict, option_indexes: Optional[dict[str, OptionIndex]] = None
+) -> dict:
+    """
+    Replace selection answers with the closest existing option values.
+
+    Answers that cannot be matched are kept as they are.
+
+    Args:
+        fields: List of form fields
+        values: Dictionary of field names to suggested values
+        option_indexes: Indexes from build_option_indexes, built from fields if omitted
+
+    Returns:
+        dict: Dictionary of field names to values, with selection answers matched
+    """
+    if option_indexes is None:
+        option_indexes = build_option_indexes(fields)
+    matched_values = dict(values)
+
+    for name, index in option_indexes.items():
+        answer = values.get(name)
+        if not isinstance(answer, str) or answer in index.values:
+            continue
+
+        matched = index.match(answer)
+        if matched is None:
+            logger.warning(f"No option of field {name} matches answer: {answer}")
+        else:
+            logger.info(f"Matched answer '{answer}' to option '{matched}' for field {name}")
+            matched_values[name] = matched
+
+    return matched_values
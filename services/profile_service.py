@@ -0,0 +1,151 @@
+"""
+Rule-based resolution of standard form fields from the user profile.
+"""
+import ast
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+from config.settings import USER_METADATA_PATH, RESUME_PATH
+from models.form_models import FormField
+from services.form_parser import normalize_label
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def load_profile(path: str = USER_METADATA_PATH) -> dict:
+    """
+    Parse the user metadata file into a structured profile.
+
+    The file is JSON-like but may use Python literals such as None, so both
+    formats are accepted. The result is cached for the lifetime of the process.
+
+    Args:
+        path: Path to the user metadata file
+
+    Returns:
+        dict: The parsed profile, or an empty dict if it cannot be parsed
+    """
+    try:
+        with open(path, "r") as f:
+            raw = f.read().strip()
+    except FileNotFoundError:
+        logger.error(f"User metadata file not found: {path}")
+        return {}
+
+    try:
+        profile = json.loads(raw)
+    except json.JSONDecodeError:
+        try:
+            profile = ast.literal_eval(raw)
+        except (ValueError, SyntaxError) as e:
+            logger.warning(f"Could not parse user metadata into a profile: {str(e)}")
+            return {}
+
+    return profile if isinstance(profile, dict) else {}
+
+def _contact(profile: dict, key: str) -> Optional[str]:
+    return (profile.get("contact_information") or {}).get(key)
+
+def _address(profile: dict, key: str) -> Optional[str]:
+    return ((profile.get("contact_information") or {}).get("current_address") or {}).get(key)
+
+def _name_part(profile: dict, index: int) -> Optional[str]:
+    parts = (profile.get("name") or "").split()
+    if not parts:
+        return None
+    return parts[0] if index == 0 else " ".join(parts[1:]) or None
+
+def _current_company(profile: dict) -> Optional[str]:
+    for job in profile.get("experience") or []:
+        if str(job.get("end_date", "")).lower() == "present":
+            return job.get("company")
+    return None
+
+def _city_state(profile: dict) -> Optional[str]:
+    parts = [_address(profile, "city"), _address(profile, "state")]
+    return ", ".join(part for part in parts if part) or None
+
+# Well-known Lever field names, matched exactly
+NAME_RULES: dict[str, Callable[[dict], Optional[str]]] = {
+    "name": lambda profile: profile.get("name"),
+    "email": lambda profile: _contact(profile, "email"),
+    "phone": lambda profile: _contact(profile, "phone"),
+    "org": _current_company,
+    "location": _city_state,
+    "resume": lambda profile: os.path.basename(RESUME_PATH),
+    "urls[LinkedIn]": lambda profile: _contact(profile, "linkedin"),
+    "urls[GitHub]": lambda profile: _contact(profile, "github"),
+    "urls[Portfolio]": lambda profile: _contact(profile, "portfolio") or _contact(profile, "website"),
+    "urls[Other]": lambda profile: _contact(profile, "website"),
+}
+
+# Common label patterns for free-text questions, matched against the lowercased label
+LABEL_RULES: list[tuple[re.Pattern, Callable[[dict], Optional[str]]]] = [
+    (re.compile(r"^(full |legal )?name$"), lambda profile: profile.get("name")),
+    (re.compile(r"^(first|given) name$"), lambda profile: _name_part(profile, 0)),
+    (re.compile(r"^(last|family|sur) ?name$"), lambda profile: _name_part(profile, 1)),
+    (re.compile(r"^e-?mail( address)?$"), lambda profile: _contact(profile, "email")),
+    (re.compile(r"^(phone|mobile|cell)( number)?$"), lambda profile: _contact(profile, "phone")),
+    (re.compile(r"^(your )?linkedin( profile)?( url| link)?$"), lambda profile: _contact(profile, "linkedin")),
+    (re.compile(r"^(your )?github( profile)?( url| link)?$"), lambda profile: _contact(profile, "github")),
+    (re.compile(r"^(current )?city$"), lambda profile: _address(profile, "city")),
+    (re.compile(r"^(current )?(state|province)$"), lambda profile: _address(profile, "state")),
+    (re.compile(r"^(zip|postal)( code)?$"), lambda profile: _address(profile, "zip_code")),
+    (re.compile(r"^current (company|employer)$"), _current_company),
+    (re.compile(r"^(total )?years of (professional )?experience$"), lambda profile: profile.get("years_of_experience")),
+]
+
+def resolve_field(field: FormField, profile: dict) -> Optional[str]:
+    """
+    Resolve a single field from the profile using the name and label rules.
+
+    Selection fields are only resolved by name, since label rules cannot
+    guarantee that the value is one of the field's options.
+
+    Args:
+        field: The form field to resolve
+        profile: The structured user profile
+
+    Returns:
+        Optional[str]: The resolved value, or None if no rule applies
+    """
+    rule = NAME_RULES.get(field.input_name)
+    if rule is None and field.is_text_input:
+        label = normalize_label(field.label)
+        rule = next((rule for pattern, rule in LABEL_RULES if pattern.search(label)), None)
+    if rule is None:
+        return None
+
+    value = rule(profile)
+    return str(value) if value not in (None, "") else None
+
+def resolve_profile_fields(required_fields: list[FormField], profile: Optional[dict] = None) -> tuple[dict, list[FormField]]:
+    """
+    Fill well-known fields directly from the user profile.
+
+    Args:
+        required_fields: List of form fields to resolve
+        profile: The structured user profile (defaults to the parsed user metadata)
+
+    Returns:
+        tuple[dict, list[FormField]]: Resolved field values, and the fields left for the AI service
+    """
+    if profile is None:
+        profile = load_profile()
+
+    resolved_values: dict = {}
+    unresolved_fields: list[FormField] = []
+
+    for field in required_fields:
+        value = resolve_field(field, profile)
+        if value is None:
+            unresolved_fields.append(field)
+        else:
+            resolved_values[field.input_name] = value
+
+    logger.info(f"Resolved {len(resolved_values)} fields from the user profile, {len(unresolved_fields)} left for the AI service")
+    return resolved_values, unresolved_fields
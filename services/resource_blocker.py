@@ -0,0 +1,71 @@
+"""
+Pattern-based blocking of analytics, third-party and static asset requests.
+"""
+import logging
+import re
+
+from config.settings import BLOCKED_HOSTS, BLOCKED_EXTENSIONS, BLOCKED_URL_GLOBS
+from utils.tracing import increment
+
+logger = logging.getLogger(__name__)
+
+def build_host_pattern(hosts: list[str]) -> re.Pattern:
+    """
+    Build a regex matching URLs on any of the hosts or their subdomains.
+
+    Args:
+        hosts: Host names such as 'google-analytics.com'
+
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    alternatives = "|".join(re.escape(host) for host in hosts)
+    return re.compile(rf"^[a-z]+://([^/?#]*\.)?({alternatives})(:\d+)?([/?#]|$)", re.IGNORECASE)
+
+def build_asset_pattern(extensions: list[str]) -> re.Pattern:
+    """
+    Build a regex matching static asset URLs by file extension.
+
+    hCaptcha challenge images are left alone so captchas can still be solved.
+
+    Args:
+        extensions: File extensions without the dot
+
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    alternatives = "|".join(re.escape(extension) for extension in extensions)
+    return re.compile(
+        rf"^(?![a-z]+://([^/?#]*\.)?hcaptcha\.com[:/])[^?#]*\.({alternatives})([?#]|$)",
+        re.IGNORECASE,
+    )
+
+def blocked_url_patterns() -> list:
+    """Return the globs and regexes for every configured blocklist entry."""
+    patterns = []
+    if BLOCKED_HOSTS:
+        patterns.append(build_host_pattern(BLOCKED_HOSTS))
+    if BLOCKED_EXTENSIONS:
+        patterns.append(build_asset_pattern(BLOCKED_EXTENSIONS))
+    patterns.extend(BLOCKED_URL_GLOBS)
+    return patterns
+
+async def abort_request(route):
+    """Abort a blocked request and count it in the trace."""
+    increment("blocked_requests")
+    await route.abort()
+
+async def block_resources(target):
+    """
+    Abort requests matching the blocklist.
+
+    Routes are registered per pattern, so requests that match none of them
+    are handled by the browser without a round trip to Python.
+
+    Args:
+        target: The Playwright browser context or page to install the routes on
+    """
+    patterns = blocked_url_patterns()
+    for pattern in patterns:
+        await target.route(pattern, abort_request)
+    logger.info(f"Blocking requests matching {len(patterns)} patterns")
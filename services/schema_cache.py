@@ -0,0 +1,139 @@
+"""
+On-disk cache of extracted form schemas.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from config.settings import APPLICATION_FORM_SELECTOR, FORM_SCHEMA_CACHE_DIR
+from models.form_models import FormField, serialize_fields, deserialize_fields
+from services.form_parser import fields_from_schema
+from services.form_service import EXTRACT_FORM_SCHEMA_JS
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints the application form in the page so only a hex digest crosses
+# IPC. When the digest differs from the cached one, the schema is extracted in
+# the same call, so a miss costs no extra round trip.
+FINGERPRINT_OR_EXTRACT_JS = f'''
+async ({{formSelector, knownFingerprint}}) => {{
+    const extractSchema = {EXTRACT_FORM_SCHEMA_JS.strip()};
+
+    const digest = async (text) => {{
+        if (window.crypto && window.crypto.subtle) {{
+            const bytes = new Uint8Array(await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text)));
+            return Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+        }}
+        // Insecure contexts have no crypto.subtle; fall back to 64-bit FNV-1a
+        let hash = 0xcbf29ce484222325n;
+        for (let i = 0; i < text.length; i++) {{
+            hash = ((hash ^ BigInt(text.charCodeAt(i))) * 0x100000001b3n) & 0xffffffffffffffffn;
+        }}
+        return 'fnv1a-' + hash.toString(16);
+    }};
+
+    // Input values typed by the user are properties rather than attributes,
+    // so they do not change the fingerprint
+    const form = document.querySelector(formSelector);
+    const markup = form
+        ? Array.from(form.querySelectorAll('ul li[class*="application-question"]'))
+            .map((li) => li.outerHTML)
+            .join('\\n')
+        : '';
+    const fingerprint = await digest(markup);
+    if (fingerprint === knownFingerprint) {{
+        return {{fingerprint: fingerprint, schema: null}};
+    }}
+    return {{fingerprint: fingerprint, schema: extractSchema({{formSelector: formSelector, onlyChanged: false}})}};
+}}
+'''
+
+def _cache_path(url: str) -> str:
+    """Return the cache file path for a posting URL."""
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(FORM_SCHEMA_CACHE_DIR, f"{url_hash}.json")
+
+def load_cached_entry(url: str) -> Optional[tuple[str, list[FormField]]]:
+    """
+    Load the cached form fields for a posting.
+
+    Args:
+        url: The posting URL
+
+    Returns:
+        Optional[tuple[str, list[FormField]]]: The fingerprint of the cached form
+            and its fields, or None on a miss
+    """
+    path = _cache_path(url)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable form schema cache entry {path}: {str(e)}")
+        return None
+
+    if entry.get("url") != url or not entry.get("fingerprint"):
+        return None
+
+    try:
+        fields = deserialize_fields(entry.get("schema", {}))
+    except ValueError as e:
+        logger.warning(f"Discarding stale form schema cache entry {path}: {str(e)}")
+        return None
+
+    return entry["fingerprint"], fields
+
+def store_cached_fields(url: str, fingerprint: str, fields: list[FormField]):
+    """
+    Store the extracted form fields for a posting.
+
+    Args:
+        url: The posting URL
+        fingerprint: Fingerprint of the form markup the fields were extracted from
+        fields: The extracted form fields
+    """
+    path = _cache_path(url)
+    entry = {"url": url, "fingerprint": fingerprint, "schema": serialize_fields(fields)}
+    try:
+        os.makedirs(FORM_SCHEMA_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write form schema cache entry {path}: {str(e)}")
+
+async def extract_form_fields_cached(page, url: str) -> tuple[list[FormField], bool]:
+    """
+    Extract the required form fields, reusing the cached schema if the form is unchanged.
+
+    The fingerprint check and, on a miss, the extraction happen in one
+    page.evaluate call.
+
+    Args:
+        page: The Playwright page object
+        url: The posting URL
+
+    Returns:
+        tuple[list[FormField], bool]: The required fields, and whether they came from the cache
+    """
+    cached = load_cached_entry(url)
+    known_fingerprint, cached_fields = cached if cached else (None, None)
+
+    result = await page.evaluate(
+        FINGERPRINT_OR_EXTRACT_JS, {"formSelector": APPLICATION_FORM_SELECTOR, "knownFingerprint": known_fingerprint}
+    )
+    if result["schema"] is None:
+        logger.info(f"Loaded {len(cached_fields)} required fields from form schema cache")
+        return cached_fields, True
+
+    if cached:
+        logger.info("Form markup changed since it was cached, re-extracted")
+    required_fields = fields_from_schema(result["schema"])
+    logger.info(f"Found {len(required_fields)} required fields in total")
+    store_cached_fields(url, result["fingerprint"], required_fields)
+    return required_fields, False
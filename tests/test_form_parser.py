@@ -0,0 +1,103 @@
+"""
+Tests for the browser-free form parser and its parity with the in-page extraction.
+"""
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.lever_stub import build_application_page
+from config.settings import APPLICATION_FORM_SELECTOR
+from models.form_models import FormField, Option
+from services.form_parser import parse_form_fields, parse_form_schema
+from services.form_service import EXTRACT_FORM_SCHEMA_JS
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "lever_application.html")
+
+EXPECTED_SCHEMA = [
+    {"label": "Resume/CV", "type": "input_file", "name": "resume", "required": True, "options": []},
+    {"label": "Full name", "type": "input_text", "name": "name", "required": True, "options": []},
+    {"label": "Email", "type": "input_email", "name": "email", "required": True, "options": []},
+    {"label": "Current company", "type": "input_text", "name": "org", "required": False, "options": []},
+    {
+        "label": "Years of experience",
+        "type": "select",
+        "name": "cards[card-1][field0]",
+        "required": True,
+        "options": [
+            {"label": "Less than 2 years", "value": "0-2"},
+            {"label": "2 years or more", "value": "2+"},
+        ],
+    },
+    {
+        "label": "Are you authorized to work here?",
+        "type": "input_radio",
+        "name": "cards[card-1][field1]",
+        "required": True,
+        "options": [{"label": "Yes", "value": "Yes"}, {"label": "No", "value": "No"}],
+    },
+    {
+        "label": "Acceptable arrangements",
+        "type": "input_checkbox",
+        "name": "cards[card-1][field2]",
+        "required": True,
+        "options": [{"label": "Remote", "value": "Remote"}, {"label": "On-site", "value": "On-site"}],
+    },
+    {"label": "Anything else?", "type": "textarea", "name": "cards[card-1][field3]", "required": True, "options": []},
+]
+
+def read_fixture() -> str:
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+def extract_in_browser(html: str) -> list[dict]:
+    """Run EXTRACT_FORM_SCHEMA_JS on the given HTML in Chromium, skipping the test if it is unavailable."""
+    async_api = pytest.importorskip("playwright.async_api")
+
+    async def extract():
+        async with async_api.async_playwright() as p:
+            try:
+                browser = await p.chromium.launch(headless=True)
+            except Exception as e:
+                pytest.skip(f"Chromium is not available: {e}")
+            try:
+                page = await browser.new_page()
+                await page.set_content(html)
+                return await page.evaluate(
+                    EXTRACT_FORM_SCHEMA_JS, {"formSelector": APPLICATION_FORM_SELECTOR, "onlyChanged": False}
+                )
+            finally:
+                await browser.close()
+
+    return asyncio.run(extract())
+
+def test_parse_form_schema_matches_expected_schema():
+    assert parse_form_schema(read_fixture()) == EXPECTED_SCHEMA
+
+def test_parse_form_fields_keeps_required_fields():
+    fields = parse_form_fields(read_fixture())
+
+    assert [field.input_name for field in fields] == [
+        entry["name"] for entry in EXPECTED_SCHEMA if entry["required"]
+    ]
+    assert fields[3] == FormField(
+        "Years of experience", "select", "cards[card-1][field0]",
+        [Option("Less than 2 years", "0-2"), Option("2 years or more", "2+")],
+    )
+
+def test_parse_form_schema_skips_hidden_questions():
+    names = {entry["name"] for entry in parse_form_schema(read_fixture())}
+
+    assert "cards[card-1][field4]" not in names
+    assert "cards[card-1][field5]" not in names
+
+def test_parse_form_schema_rejects_non_id_selector():
+    with pytest.raises(ValueError):
+        parse_form_schema(read_fixture(), "form.application")
+
+def test_parse_form_schema_without_form_is_empty():
+    assert parse_form_schema("<html><body><p>Closed</p></body></html>") == []
+
+@pytest.mark.parametrize("html", [read_fixture(), build_application_page(10)], ids=["fixture", "stub"])
+def test_parse_form_schema_matches_browser_extraction(html):
+    assert parse_form_schema(html) == extract_in_browser(html)
@@ -0,0 +1,56 @@
+"""
+Tests for matching free-form answers to the options of selection fields.
+"""
+from models.form_models import FormField, Option
+from services.option_matcher import OptionIndex, build_option_indexes, match_field_values
+
+YES_NO_NONE = FormField(
+    "Do you hold any of these certifications?", "input_radio", "cards[card-1][field0]",
+    [Option("Yes", "Yes"), Option("No", "No"), Option("None of the above", "None of the above")],
+)
+
+EXPERIENCE = FormField(
+    "Years of experience", "select", "cards[card-1][field1]",
+    [Option("Less than 2 years", "0-2"), Option("2 years or more", "2+")],
+)
+
+def test_match_keeps_exact_value():
+    assert OptionIndex(EXPERIENCE).match("0-2") == "0-2"
+
+def test_match_maps_label_to_value():
+    assert OptionIndex(EXPERIENCE).match("2 years or more") == "2+"
+
+def test_match_ignores_case_and_punctuation():
+    index = OptionIndex(YES_NO_NONE)
+
+    assert index.match("yes") == "Yes"
+    assert index.match(" NO. ") == "No"
+
+def test_match_applies_synonyms():
+    index = OptionIndex(YES_NO_NONE)
+
+    assert index.match("Y") == "Yes"
+    assert index.match("true") == "Yes"
+    assert index.match("false") == "No"
+
+def test_match_does_not_map_none_to_no():
+    index = OptionIndex(YES_NO_NONE)
+
+    assert index.match("None") == "None of the above"
+    assert index.match("N/A") is None
+
+def test_match_uses_token_overlap():
+    assert OptionIndex(EXPERIENCE).match("I have less than 2 years") == "0-2"
+
+def test_match_returns_none_without_close_option():
+    assert OptionIndex(EXPERIENCE).match("Astronaut") is None
+
+def test_match_field_values_keeps_unmatched_answers():
+    fields = [YES_NO_NONE, EXPERIENCE, FormField("Full name", "input_text", "name")]
+    values = {"cards[card-1][field0]": "yes", "cards[card-1][field1]": "Astronaut", "name": "Ada"}
+
+    assert match_field_values(fields, values, build_option_indexes(fields)) == {
+        "cards[card-1][field0]": "Yes",
+        "cards[card-1][field1]": "Astronaut",
+        "name": "Ada",
+    }
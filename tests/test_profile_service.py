@@ -0,0 +1,57 @@
+"""
+Tests for resolving standard form fields from the user profile.
+"""
+import pytest
+
+from models.form_models import FormField
+from services.profile_service import resolve_profile_fields
+
+PROFILE = {
+    "name": "Ada Lovelace",
+    "contact_information": {
+        "email": "ada@example.com",
+        "linkedin": "https://www.linkedin.com/in/ada",
+        "github": "https://github.com/ada",
+        "current_address": {"city": "London", "state": "England"},
+    },
+    "experience": [{"company": "Analytical Engines", "end_date": "Present"}],
+}
+
+def text_field(label: str, name: str = "cards[card-1][field0]") -> FormField:
+    return FormField(label, "input_text", name)
+
+def test_resolves_well_known_field_names():
+    fields = [text_field("Full name", "name"), text_field("Current company", "org"), text_field("Location", "location")]
+
+    resolved, unresolved = resolve_profile_fields(fields, PROFILE)
+
+    assert resolved == {"name": "Ada Lovelace", "org": "Analytical Engines", "location": "London, England"}
+    assert unresolved == []
+
+@pytest.mark.parametrize("label, expected", [
+    ("First name", "Ada"),
+    ("Last name", "Lovelace"),
+    ("Email address*", "ada@example.com"),
+    ("LinkedIn Profile", "https://www.linkedin.com/in/ada"),
+    ("LinkedIn URL", "https://www.linkedin.com/in/ada"),
+    ("GitHub URL:", "https://github.com/ada"),
+])
+def test_resolves_labels(label, expected):
+    resolved, _ = resolve_profile_fields([text_field(label)], PROFILE)
+
+    assert resolved == {"cards[card-1][field0]": expected}
+
+@pytest.mark.parametrize("label", [
+    "How did you hear about us? (e.g. LinkedIn, referral)",
+    "Describe a GitHub project you are proud of",
+    "Phone",
+])
+def test_leaves_other_questions_for_the_ai_service(label):
+    field = text_field(label)
+
+    assert resolve_profile_fields([field], PROFILE) == ({}, [field])
+
+def test_selection_fields_are_not_resolved_by_label():
+    field = FormField("LinkedIn", "select", "cards[card-1][field0]")
+
+    assert resolve_profile_fields([field], PROFILE) == ({}, [field])
@@ -1,4 +1,21 @@
-from utils.logging_utils import setup_logging
-from utils.human_simulation import human_like_delay, human_like_typing
+"""
+Utilities package; submodules are imported on first attribute access.
+"""
+import importlib
 
-__all__ = ['setup_logging', 'human_like_delay', 'human_like_typing']
\ No newline at end of file
+_EXPORTS = {
+    'setup_logging': 'utils.logging_utils',
+    'human_like_delay': 'utils.human_simulation',
+    'human_like_typing': 'utils.human_simulation',
+    'span': 'utils.tracing',
+    'write_trace': 'utils.tracing',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -3,11 +3,16 @@ Utilities for simulating human-like behavior in browser interactions.
 """
 import random
 import logging
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
+
+from config.settings import HUMAN_DELAY_SCALE
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
-async def human_like_delay(page: Page, min_delay: float = 0.5, max_delay: float = 2.0):
+async def human_like_delay(page: "Page", min_delay: float = 0.5, max_delay: float = 2.0):
     """
     Add random delay and scrolling to mimic human behavior.
     
@@ -17,7 +22,7 @@ async def human_like_delay(page: Page, min_delay: float = 0.5, max_delay: float
         max_delay: Maximum delay in seconds
     """
     # Random delay between actions
-    delay = random.uniform(min_delay, max_delay)
+    delay = random.uniform(min_delay, max_delay) * HUMAN_DELAY_SCALE
     await page.wait_for_timeout(delay * 1000)  # Convert to milliseconds
     
     # Random scrolling behavior (70% chance to scroll)
@@ -55,5 +60,5 @@ async def human_like_typing(element, text, min_delay=50, max_delay=150):
     
     # Type each character with a random delay
     for char in text:
-        delay = random.randint(min_delay, max_delay)
+        delay = random.randint(min_delay, max_delay) * HUMAN_DELAY_SCALE
         await element.type(char, delay=delay)
\ No newline at end of file
@@ -1,33 +1,87 @@
 """
 Logging configuration for the application.
 """
+import atexit
 import logging
 import os
-from datetime import datetime
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config.settings import LOG_DIR, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_PAYLOADS
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Logger for prompts, raw model responses and other large payloads
+PAYLOAD_LOGGER_NAME = "payloads"
+
+_listeners: list[QueueListener] = []
+
+def get_payload_logger() -> logging.Logger:
+    """Return the logger for large payloads, which only writes when LOG_PAYLOADS is on."""
+    return logging.getLogger(PAYLOAD_LOGGER_NAME)
+
+def _rotating_file_handler(filename: str) -> RotatingFileHandler:
+    handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, filename),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+def _queue_logging(logger: logging.Logger, *handlers: logging.Handler):
+    """
+    Route a logger's records through a queue to handlers on a listener thread.
+
+    Args:
+        logger: The logger to attach the queue to
+        *handlers: Handlers that do the actual I/O
+    """
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
 
 def setup_logging(log_level=logging.INFO):
     """
     Set up logging configuration for the application.
     
+    Records are handed to a queue and written by a listener thread, so logging
+    from the event loop never blocks on file or console I/O.
+    
     Args:
         log_level: The log level to use (default: logging.INFO)
     """
+    if _listeners:
+        return
+
     # Create logs directory if it doesn't exist
-    os.makedirs("logs", exist_ok=True)
-    
-    # Generate log filename based on current date and time
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"logs/job_application_{timestamp}.log"
-    
-    # Configure logging
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()
-        ]
-    )
-    
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    _queue_logging(root_logger, _rotating_file_handler("job_application.log"), console_handler)
+
+    # Payloads never reach the main log; they get their own file when enabled
+    payload_logger = get_payload_logger()
+    payload_logger.propagate = False
+    if LOG_PAYLOADS:
+        payload_logger.setLevel(logging.DEBUG)
+        _queue_logging(payload_logger, _rotating_file_handler("payloads.log"))
+    else:
+        payload_logger.setLevel(logging.CRITICAL + 1)
+
+    atexit.register(stop_logging)
+
     # Log startup message
-    logging.info(f"Logging initialized. Log file: {log_filename}")
\ No newline at end of file
+    logging.info(f"Logging initialized. Log file: {os.path.join(LOG_DIR, 'job_application.log')}")
+
+def stop_logging():
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
@@ -0,0 +1,233 @@
+"""
+Lightweight timing spans and a machine-readable run trace.
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from config.settings import TRACE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Page methods that round-trip to the browser and are worth counting
+PAGE_METHODS = [
+    'goto', 'evaluate', 'query_selector', 'query_selector_all', 'wait_for_selector',
+    'wait_for_function', 'wait_for_timeout', 'wait_for_event', 'wait_for_load_state',
+    'expect_response', 'select_option', 'check', 'click', 'fill', 'press', 'inner_html', 'route',
+]
+
+# Element handle methods that round-trip to the browser
+HANDLE_METHODS = [
+    'type', 'fill', 'press', 'click', 'check', 'select_option', 'set_input_files', 'input_value',
+    'scroll_into_view_if_needed', 'get_attribute', 'inner_text', 'is_visible', 'focus', 'evaluate',
+    'query_selector', 'query_selector_all', 'wait_for_selector',
+]
+
+# Methods whose results are element handles that should be counted too
+HANDLE_RETURNING_METHODS = {'query_selector', 'query_selector_all', 'wait_for_selector'}
+
+class Tracer:
+    """Collects spans, counters and LLM token usage for one run."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far and restart the trace clock."""
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.spans: list[dict] = []
+        self.counters: Counter = Counter()
+        self.token_usage: Counter = Counter()
+        self.next_id = 0
+
+    def to_dict(self) -> dict:
+        """Return the trace as a JSON-serializable dict."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - self.origin) * 1000, 3),
+            "spans": self.spans,
+            "counters": dict(self.counters),
+            "token_usage": dict(self.token_usage),
+        }
+
+tracer = Tracer()
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+class span:
+    """
+    Time a stage of the run.
+
+    Usable as a context manager (``with span("extract"):``), an async context
+    manager, or a decorator on sync and async functions. Spans nest: the
+    enclosing span is recorded as the parent.
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.record: Optional[dict] = None
+        self._token = None
+        self._start = 0.0
+
+    def __enter__(self) -> "span":
+        self._start = time.perf_counter()
+        self.record = {
+            "id": tracer.next_id,
+            "parent": _current_span.get(),
+            "name": self.name,
+            "start_ms": round((self._start - tracer.origin) * 1000, 3),
+            "duration_ms": None,
+            "attributes": dict(self.attributes),
+        }
+        tracer.next_id += 1
+        tracer.spans.append(self.record)
+        self._token = _current_span.set(self.record["id"])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.record["duration_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        if exc_type is not None:
+            self.record["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        return False
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return self.__exit__(exc_type, exc_value, traceback)
+
+    def set(self, **attributes):
+        """Add attributes to the running span."""
+        self.record["attributes"].update(attributes)
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(self.name, **self.attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(self.name, **self.attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+def increment(counter: str, amount: int = 1):
+    """Increase a named counter in the trace."""
+    tracer.counters[counter] += amount
+
+def record_token_usage(usage):
+    """
+    Add LLM token usage to the trace.
+
+    Args:
+        usage: An OpenAI usage object with prompt, completion and total token counts
+    """
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        tracer.token_usage[key] += getattr(usage, key, 0) or 0
+
+def _instrument(target, methods: list[str], prefix: str):
+    """
+    Wrap the browser round-trip methods of a page or element handle in place.
+
+    Every call adds to the ``playwright_calls`` counter and a per-method
+    counter. Element handles returned by query methods are instrumented too.
+
+    Args:
+        target: The Playwright page or element handle
+        methods: Names of the methods to count
+        prefix: Counter name prefix, e.g. 'playwright.element'
+
+    Returns:
+        The same object
+    """
+    for name in methods:
+        method = getattr(target, name, None)
+        if method is None:
+            continue
+
+        if inspect.iscoroutinefunction(method):
+            async def counted(*args, _method=method, _name=name, **kwargs):
+                increment("playwright_calls")
+                increment(f"{prefix}.{_name}")
+                result = await _method(*args, **kwargs)
+                return _instrument_result(result) if _name in HANDLE_RETURNING_METHODS else result
+        else:
+            def counted(*args, _method=method, _name=name, **kwargs):
+                increment("playwright_calls")
+                increment(f"{prefix}.{_name}")
+                return _method(*args, **kwargs)
+
+        setattr(target, name, functools.wraps(method)(counted))
+    return target
+
+def _instrument_result(result):
+    """Instrument the element handle or list of handles returned by a query."""
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return [instrument_handle(handle) for handle in result]
+    return instrument_handle(result)
+
+def instrument_handle(handle):
+    """
+    Count Playwright calls made through an element handle.
+
+    Args:
+        handle: The Playwright element handle
+
+    Returns:
+        The same element handle
+    """
+    return _instrument(handle, HANDLE_METHODS, "playwright.element")
+
+def instrument_page(page):
+    """
+    Count Playwright calls made through a page.
+
+    Wraps the page's browser round-trip methods in place so every call adds to
+    the ``playwright_calls`` counter and a per-method counter. Element handles
+    returned by the page, such as the per-character typing targets, are
+    counted as well.
+
+    Args:
+        page: The Playwright page object
+
+    Returns:
+        The same page object
+    """
+    return _instrument(page, PAGE_METHODS, "playwright")
+
+def write_trace(path: Optional[str] = None) -> str:
+    """
+    Write the run trace as JSON.
+
+    Args:
+        path: Output path (default: a timestamped file in TRACE_DIR)
+
+    Returns:
+        str: The path the trace was written to
+    """
+    if path is None:
+        timestamp = tracer.started_at.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(TRACE_DIR, f"run_{timestamp}.json")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tracer.to_dict(), f, indent=2)
+
+    logger.info(f"Run trace written to {path}")
+    return path